@@ -31,6 +31,7 @@ from .common import (
     VEXO_FAIL2BAN_DIR,
     ensure_data_dir,
 )
+from .whitelist import is_whitelisted
 
 
 PERMANENT_BANS_FILE = VEXO_FAIL2BAN_DIR / "permanent_bans.json"
@@ -167,6 +168,9 @@ def ban_ip_menu():
         press_enter_to_continue()
         return
     
+    if is_whitelisted(ip):
+        show_warning(f"{ip} is in the fail2ban whitelist (ignoreip).")
+    
     jail = select_from_list(
         title="Select Jail",
         message="Ban in which jail?",
@@ -141,6 +141,21 @@ def is_valid_cidr(cidr):
     return _validate_cidr(cidr)
 
 
+def classify_ip_entry(value):
+    """
+    Classify a whitelist/ban entry as a single IP or a CIDR range.
+    
+    The '/' check picks the validator up front, so each value is parsed
+    once instead of trying the IP check and then the CIDR check.
+    
+    Returns:
+        str: "ip", "range", or None if the value is invalid
+    """
+    if '/' in value:
+        return "range" if _validate_cidr(value) else None
+    return "ip" if _validate_ip(value) else None
+
+
 def detect_services():
     """Detect installed services for jail configuration."""
     return {
@@ -26,7 +26,6 @@ from .common import (
     JAIL_D_DIR,
     FILTER_D_DIR,
 )
-from .templates import get_template, get_templates_by_category
 
 
 def show_menu():
@@ -312,6 +311,8 @@ def create_custom_jail():
 
 def install_from_template():
     """Install a jail from predefined template."""
+    from .templates import get_template, get_templates_by_category, validate_template
+    
     clear_screen()
     show_header()
     show_panel("Install from Template", title="Jail Management", style="cyan")
@@ -354,6 +355,12 @@ def install_from_template():
     template_name = template_names[idx]
     template = get_template(template_name)
     
+    error = validate_template(template_name)
+    if error:
+        handle_error("E6003", f"Template '{template_name}' has an invalid pattern.", details=error)
+        press_enter_to_continue()
+        return
+    
     console.print()
     console.print(f"[bold]{template['display_name']}[/bold]")
     console.print(f"[dim]{template['description']}[/dim]")
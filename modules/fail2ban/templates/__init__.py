@@ -1,5 +1,7 @@
 """Jail templates for fail2ban module."""
 
+import re
+
 from .web_apps import WEB_APP_TEMPLATES
 from .web_security import WEB_SECURITY_TEMPLATES
 
@@ -9,6 +11,9 @@ ALL_TEMPLATES = {
     **WEB_SECURITY_TEMPLATES,
 }
 
+# Local stand-in for fail2ban's <HOST> substitution
+HOST_REGEX = r"(?P<host>\S+)"
+
 
 def get_template(name):
     """Get a template by name."""
@@ -34,3 +39,73 @@ def list_templates():
             "category": template.get("category", "Other"),
         })
     return templates
+
+
+def get_filter_patterns(name, option="failregex"):
+    """
+    Get the patterns of a filter option from a template's filter content.
+    
+    Args:
+        name: Template name
+        option: Filter option, "failregex" or "ignoreregex"
+    
+    Returns:
+        list: Pattern lines (continuation lines included)
+    """
+    template = ALL_TEMPLATES.get(name)
+    if not template:
+        return []
+    
+    patterns = []
+    in_option = False
+    
+    for line in template['filter_content'].split('\n'):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        
+        if '=' in line and not line[0].isspace():
+            key, value = line.split('=', 1)
+            in_option = key.strip() == option
+            if in_option and value.strip():
+                patterns.append(value.strip())
+        elif in_option:
+            patterns.append(stripped)
+    
+    return patterns
+
+
+def compile_filter(name, option="failregex"):
+    """
+    Compile a template's filter patterns.
+    
+    Args:
+        name: Template name
+        option: Filter option, "failregex" or "ignoreregex"
+    
+    Returns:
+        tuple: Compiled patterns
+    """
+    return tuple(
+        re.compile(pattern.replace("<HOST>", HOST_REGEX))
+        for pattern in get_filter_patterns(name, option)
+    )
+
+
+def validate_template(name):
+    """
+    Check that every filter pattern of a template compiles.
+    
+    Args:
+        name: Template name
+    
+    Returns:
+        str: Error description, or None if the template is valid
+    """
+    for option in ("failregex", "ignoreregex"):
+        try:
+            compile_filter(name, option)
+        except re.error as e:
+            return f"{option}: {e}"
+    return None
+
@@ -1,7 +1,11 @@
 """Whitelist management for fail2ban module."""
 
+import bisect
+import copy
+import ipaddress
 import json
 import os
+import re
 from datetime import datetime
 
 from ui.components import (
@@ -16,12 +20,13 @@ from ui.components import (
     press_enter_to_continue,
 )
 from ui.menu import confirm_action, text_input, select_from_list, run_menu_loop
-from utils.shell import run_command, require_root, service_control
+from utils.shell import require_root, service_control
 from utils.error_handler import handle_error
 
 from .common import (
     is_valid_ip,
     is_valid_cidr,
+    classify_ip_entry,
     get_active_jails,
     VEXO_FAIL2BAN_DIR,
     JAIL_LOCAL,
@@ -29,11 +34,33 @@ from .common import (
     ensure_data_dir,
 )
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 WHITELIST_FILE = VEXO_FAIL2BAN_DIR / "whitelist.json"
 TRUSTED_SOURCES_FILE = VEXO_FAIL2BAN_DIR / "trusted_sources.json"
 
 
+DEFAULT_IGNORE = ("127.0.0.1", "::1")
+
+# jail.local line matchers used when rewriting ignoreip
+_SECTION_RE = re.compile(r'\s*\[([^\]]*)\]')
+_IGNOREIP_RE = re.compile(r'\s*ignoreip\s*[=:]')
+
+# Parsed JSON data files: path -> ((mtime_ns, size), data, raw bytes)
+_JSON_CACHE = {}
+
+# Sorted, collapsed whitelist ranges per IP version, rebuilt when the file changes
+_LOOKUP_CACHE = {'mtime': None, 'ranges': None}
+
+# Last rendered ignoreip line and the entries it was built from
+_IGNOREIP_CACHE = {'entries': None, 'line': None}
+
+
 TRUSTED_SOURCES = {
     "cloudflare_ipv4": {
         "name": "Cloudflare IPv4",
@@ -51,9 +78,8 @@ TRUSTED_SOURCES = {
 def show_menu():
     """Display whitelist management menu."""
     def get_status():
-        whitelist = _load_whitelist()
-        count = len(whitelist.get('global', {}).get('ips', []))
-        count += len(whitelist.get('global', {}).get('ranges', []))
+        global_wl = _load_whitelist().get('global', {})
+        count = len(global_wl.get('ips', [])) + len(global_wl.get('ranges', []))
         return f"{count} whitelisted IPs/ranges"
     
     def get_options():
@@ -109,8 +135,8 @@ def _view_global_whitelist():
     whitelist = _load_whitelist()
     global_wl = whitelist.get('global', {})
     
-    ips = global_wl.get('ips', [])
-    ranges = global_wl.get('ranges', [])
+    ips = global_wl.get('ips', {})
+    ranges = global_wl.get('ranges', {})
     groups = global_wl.get('groups', [])
     
     if not ips and not ranges and not groups:
@@ -125,17 +151,11 @@ def _view_global_whitelist():
     ]
     
     rows = []
-    for ip in ips:
-        if isinstance(ip, dict):
-            rows.append(["IP", ip.get('value', ''), ip.get('description', '')])
-        else:
-            rows.append(["IP", ip, ""])
+    for ip, meta in ips.items():
+        rows.append(["IP", ip, meta.get('description', '')])
     
-    for r in ranges:
-        if isinstance(r, dict):
-            rows.append(["Range", r.get('value', ''), r.get('description', '')])
-        else:
-            rows.append(["Range", r, ""])
+    for cidr, meta in ranges.items():
+        rows.append(["Range", cidr, meta.get('description', '')])
     
     for g in groups:
         rows.append(["Group", g, "(see IP Groups)"])
@@ -171,21 +191,18 @@ def _add_global_ip():
         default=""
     )
     
-    whitelist = _load_whitelist()
-    if 'global' not in whitelist:
-        whitelist['global'] = {'ips': [], 'ranges': [], 'groups': []}
+    whitelist = _load_whitelist(for_update=True)
+    ips = whitelist.setdefault('global', {'ips': {}, 'ranges': {}, 'groups': []}).setdefault('ips', {})
     
-    existing = [x.get('value') if isinstance(x, dict) else x for x in whitelist['global'].get('ips', [])]
-    if ip in existing:
+    if ip in ips:
         show_warning(f"IP {ip} is already in whitelist.")
         press_enter_to_continue()
         return
     
-    whitelist['global']['ips'].append({
-        'value': ip,
+    ips[ip] = {
         'description': description,
         'added': datetime.now().isoformat()
-    })
+    }
     
     _save_whitelist(whitelist)
     show_success(f"IP {ip} added to global whitelist!")
@@ -226,15 +243,18 @@ def _add_global_range():
         default=""
     )
     
-    whitelist = _load_whitelist()
-    if 'global' not in whitelist:
-        whitelist['global'] = {'ips': [], 'ranges': [], 'groups': []}
+    whitelist = _load_whitelist(for_update=True)
+    ranges = whitelist.setdefault('global', {'ips': {}, 'ranges': {}, 'groups': []}).setdefault('ranges', {})
     
-    whitelist['global']['ranges'].append({
-        'value': cidr,
+    if cidr in ranges:
+        show_warning(f"Range {cidr} is already in whitelist.")
+        press_enter_to_continue()
+        return
+    
+    ranges[cidr] = {
         'description': description,
         'added': datetime.now().isoformat()
-    })
+    }
     
     _save_whitelist(whitelist)
     show_success(f"Range {cidr} added to global whitelist!")
@@ -251,16 +271,14 @@ def _remove_global_entry():
     show_header()
     show_panel("Remove from Global Whitelist", title="Whitelist", style="cyan")
     
-    whitelist = _load_whitelist()
+    whitelist = _load_whitelist(for_update=True)
     global_wl = whitelist.get('global', {})
     
     all_entries = []
-    for ip in global_wl.get('ips', []):
-        val = ip.get('value') if isinstance(ip, dict) else ip
-        all_entries.append(('ip', val))
-    for r in global_wl.get('ranges', []):
-        val = r.get('value') if isinstance(r, dict) else r
-        all_entries.append(('range', val))
+    for ip in global_wl.get('ips', {}):
+        all_entries.append(('ip', ip))
+    for cidr in global_wl.get('ranges', {}):
+        all_entries.append(('range', cidr))
     
     if not all_entries:
         show_info("No entries to remove.")
@@ -287,16 +305,8 @@ def _remove_global_entry():
         press_enter_to_continue()
         return
     
-    if entry_type == "ip":
-        whitelist['global']['ips'] = [
-            x for x in whitelist['global']['ips']
-            if (x.get('value') if isinstance(x, dict) else x) != value
-        ]
-    else:
-        whitelist['global']['ranges'] = [
-            x for x in whitelist['global']['ranges']
-            if (x.get('value') if isinstance(x, dict) else x) != value
-        ]
+    kind = 'ips' if entry_type == "ip" else 'ranges'
+    global_wl[kind].pop(value, None)
     
     _save_whitelist(whitelist)
     show_success(f"Entry {value} removed!")
@@ -376,12 +386,12 @@ def _manage_jail_whitelist(jail):
         if not value:
             return
         
-        if not is_valid_ip(value) and not is_valid_cidr(value):
+        if not classify_ip_entry(value):
             handle_error("E6003", "Invalid IP or CIDR format.")
             press_enter_to_continue()
             return
         
-        whitelist = _load_whitelist()
+        whitelist = _load_whitelist(for_update=True)
         if 'per_jail' not in whitelist:
             whitelist['per_jail'] = {}
         if jail not in whitelist['per_jail']:
@@ -400,7 +410,7 @@ def _manage_jail_whitelist(jail):
         clear_screen()
         show_header()
         
-        whitelist = _load_whitelist()
+        whitelist = _load_whitelist(for_update=True)
         entries = whitelist.get('per_jail', {}).get(jail, {}).get('entries', [])
         
         if not entries:
@@ -498,6 +508,7 @@ def _create_group():
     console.print()
     
     entries = []
+    seen = set()
     while True:
         entry = text_input(
             title="Add Entry",
@@ -508,8 +519,11 @@ def _create_group():
         if not entry:
             break
         
-        if is_valid_ip(entry) or is_valid_cidr(entry):
+        if entry in seen:
+            show_warning(f"Already added: {entry}")
+        elif classify_ip_entry(entry):
             entries.append(entry)
+            seen.add(entry)
         else:
             show_warning(f"Invalid format: {entry}")
     
@@ -518,7 +532,7 @@ def _create_group():
         press_enter_to_continue()
         return
     
-    whitelist = _load_whitelist()
+    whitelist = _load_whitelist(for_update=True)
     if 'groups' not in whitelist:
         whitelist['groups'] = {}
     
@@ -539,7 +553,7 @@ def _edit_group():
     show_header()
     show_panel("Edit IP Group", title="Whitelist", style="cyan")
     
-    whitelist = _load_whitelist()
+    whitelist = _load_whitelist(for_update=True)
     groups = whitelist.get('groups', {})
     
     if not groups:
@@ -574,7 +588,7 @@ def _edit_group():
             title="New Entry",
             message="Enter IP/range to add:"
         )
-        if entry and (is_valid_ip(entry) or is_valid_cidr(entry)):
+        if entry and classify_ip_entry(entry):
             whitelist['groups'][name]['entries'].append(entry)
             _save_whitelist(whitelist)
             show_success(f"Added {entry} to group!")
@@ -600,7 +614,7 @@ def _delete_group():
     clear_screen()
     show_header()
     
-    whitelist = _load_whitelist()
+    whitelist = _load_whitelist(for_update=True)
     groups = whitelist.get('groups', {})
     
     if not groups:
@@ -631,7 +645,7 @@ def trusted_sources_menu():
     console.print("[dim]Auto-whitelist IPs from trusted services:[/dim]")
     console.print()
     
-    trusted = _load_trusted_sources()
+    trusted = _load_trusted_sources(for_update=True)
     
     for key, source in TRUSTED_SOURCES.items():
         enabled = trusted.get(key, {}).get('enabled', False)
@@ -667,37 +681,71 @@ def trusted_sources_menu():
     press_enter_to_continue()
 
 
+def _fetch_source(source):
+    """
+    Download and validate the IP list of a trusted source.
+    
+    Args:
+        source: Entry from TRUSTED_SOURCES
+    
+    Returns:
+        list: Valid IPs/ranges from the source
+    """
+    import urllib.request
+    
+    with urllib.request.urlopen(source['url'], timeout=10) as response:
+        content = response.read().decode('utf-8')
+    
+    ips = [line.strip() for line in content.splitlines()]
+    ips = [ip for ip in ips if ip and classify_ip_entry(ip)]
+    if not ips:
+        raise ValueError("no valid IPs/ranges in response")
+    return ips
+
+
 def _update_trusted_sources():
     """Update IPs from trusted sources."""
-    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor, as_completed
     
-    trusted = _load_trusted_sources()
-    whitelist = _load_whitelist()
+    trusted = _load_trusted_sources(for_update=True)
+    whitelist = _load_whitelist(for_update=True)
     
     if 'trusted_ips' not in whitelist:
         whitelist['trusted_ips'] = {}
     
-    for key, source in TRUSTED_SOURCES.items():
-        if not trusted.get(key, {}).get('enabled', False):
-            continue
-        
-        console.print(f"Updating {source['name']}...")
-        
-        try:
-            with urllib.request.urlopen(source['url'], timeout=10) as response:
-                content = response.read().decode('utf-8')
-                ips = [line.strip() for line in content.split('\n') if line.strip()]
-                
-                whitelist['trusted_ips'][key] = {
-                    'source': source['name'],
-                    'entries': ips,
-                    'updated': datetime.now().isoformat()
-                }
-                
-                trusted[key]['last_update'] = datetime.now().isoformat()
-                console.print(f"  [green]✓[/green] {len(ips)} entries")
-        except Exception as e:
-            console.print(f"  [red]✗[/red] Failed: {e}")
+    enabled = {
+        key: source for key, source in TRUSTED_SOURCES.items()
+        if trusted.get(key, {}).get('enabled', False)
+    }
+    if not enabled:
+        show_info("No trusted sources enabled.")
+        return
+    
+    console.print(f"Updating {len(enabled)} source(s)...")
+    updated = datetime.now().isoformat()
+    
+    with ThreadPoolExecutor(max_workers=min(8, len(enabled))) as executor:
+        futures = {
+            executor.submit(_fetch_source, source): key
+            for key, source in enabled.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            name = enabled[key]['name']
+            try:
+                ips = future.result()
+            except Exception as e:
+                console.print(f"  [red]✗[/red] {name}: Failed: {e}")
+                continue
+            
+            whitelist['trusted_ips'][key] = {
+                'source': name,
+                'entries': ips,
+                'updated': updated
+            }
+            
+            trusted[key]['last_update'] = updated
+            console.print(f"  [green]✓[/green] {name}: {len(ips)} entries")
     
     _save_whitelist(whitelist)
     _save_trusted_sources(trusted)
@@ -738,22 +786,22 @@ def import_export_menu():
 
 def _export_whitelist(path):
     """Export whitelist to file."""
-    whitelist = _load_whitelist()
+    global_wl = _load_whitelist().get('global', {})
+    
+    lines = [
+        "# Vexo Fail2ban Whitelist Export",
+        f"# Generated: {datetime.now().isoformat()}",
+        "",
+        "# Global IPs",
+    ]
+    lines.extend(global_wl.get('ips', {}))
+    
+    lines.append("")
+    lines.append("# Global Ranges")
+    lines.extend(global_wl.get('ranges', {}))
     
     try:
-        with open(path, 'w') as f:
-            f.write("# Vexo Fail2ban Whitelist Export\n")
-            f.write(f"# Generated: {datetime.now().isoformat()}\n\n")
-            
-            f.write("# Global IPs\n")
-            for ip in whitelist.get('global', {}).get('ips', []):
-                val = ip.get('value') if isinstance(ip, dict) else ip
-                f.write(f"{val}\n")
-            
-            f.write("\n# Global Ranges\n")
-            for r in whitelist.get('global', {}).get('ranges', []):
-                val = r.get('value') if isinstance(r, dict) else r
-                f.write(f"{val}\n")
+        _write_atomic(path, ("\n".join(lines) + "\n").encode('utf-8'))
         
         show_success(f"Exported to {path}")
     except Exception as e:
@@ -766,11 +814,7 @@ def _import_whitelist(path):
         handle_error("E6003", f"File not found: {path}")
         return
     
-    whitelist = _load_whitelist()
-    if 'global' not in whitelist:
-        whitelist['global'] = {'ips': [], 'ranges': [], 'groups': []}
-    
-    imported = 0
+    new_entries = {'ips': {}, 'ranges': {}}
     try:
         with open(path, 'r') as f:
             for line in f:
@@ -778,25 +822,31 @@ def _import_whitelist(path):
                 if not line or line.startswith('#'):
                     continue
                 
-                if is_valid_ip(line):
-                    whitelist['global']['ips'].append({
-                        'value': line,
-                        'description': 'Imported',
-                        'added': datetime.now().isoformat()
-                    })
-                    imported += 1
-                elif is_valid_cidr(line):
-                    whitelist['global']['ranges'].append({
-                        'value': line,
-                        'description': 'Imported',
-                        'added': datetime.now().isoformat()
-                    })
-                    imported += 1
-        
-        _save_whitelist(whitelist)
-        show_success(f"Imported {imported} entries!")
+                entry_type = classify_ip_entry(line)
+                if entry_type is None:
+                    continue
+                new_entries['ips' if entry_type == "ip" else 'ranges'][line] = None
     except Exception as e:
         handle_error("E6003", f"Import failed: {e}")
+        return
+    
+    whitelist = _load_whitelist(for_update=True)
+    global_wl = whitelist.setdefault('global', {'ips': {}, 'ranges': {}, 'groups': []})
+    
+    added = datetime.now().isoformat()
+    imported = 0
+    for kind, values in new_entries.items():
+        entries = global_wl.setdefault(kind, {})
+        for value in values:
+            if value not in entries:
+                entries[value] = {'description': 'Imported', 'added': added}
+                imported += 1
+    
+    if imported and not _save_whitelist(whitelist):
+        handle_error("E6003", "Import failed: could not save whitelist.")
+        return
+    
+    show_success(f"Imported {imported} entries!")
 
 
 def apply_whitelist():
@@ -834,63 +884,24 @@ def _apply_whitelist_to_fail2ban():
     """Apply whitelist to fail2ban ignoreip directive."""
     whitelist = _load_whitelist()
     
-    all_ips = set()
-    
-    for ip in whitelist.get('global', {}).get('ips', []):
-        val = ip.get('value') if isinstance(ip, dict) else ip
-        all_ips.add(val)
-    
-    for r in whitelist.get('global', {}).get('ranges', []):
-        val = r.get('value') if isinstance(r, dict) else r
-        all_ips.add(val)
+    all_ips = frozenset(_collect_entries(whitelist))
     
-    for group_name in whitelist.get('global', {}).get('groups', []):
-        group = whitelist.get('groups', {}).get(group_name, {})
-        for entry in group.get('entries', []):
-            all_ips.add(entry)
-    
-    for source, data in whitelist.get('trusted_ips', {}).items():
-        for entry in data.get('entries', []):
-            all_ips.add(entry)
-    
-    all_ips.add("127.0.0.1")
-    all_ips.add("::1")
-    
-    ignoreip_line = f"ignoreip = {' '.join(sorted(all_ips))}"
+    if _IGNOREIP_CACHE['entries'] != all_ips:
+        _IGNOREIP_CACHE['line'] = f"ignoreip = {' '.join(sorted(all_ips))}"
+        _IGNOREIP_CACHE['entries'] = all_ips
+    ignoreip_line = _IGNOREIP_CACHE['line']
     
     try:
         if os.path.exists(JAIL_LOCAL):
             with open(JAIL_LOCAL, 'r') as f:
-                lines = f.readlines()
+                content = f.read()
         else:
-            lines = ["[DEFAULT]\n"]
-        
-        new_lines = []
-        ignoreip_updated = False
-        in_default = False
-        
-        for line in lines:
-            if line.strip() == '[DEFAULT]':
-                in_default = True
-                new_lines.append(line)
-                continue
-            elif line.strip().startswith('[') and line.strip() != '[DEFAULT]':
-                if in_default and not ignoreip_updated:
-                    new_lines.append(f"{ignoreip_line}\n")
-                    ignoreip_updated = True
-                in_default = False
-            
-            if in_default and line.strip().startswith('ignoreip'):
-                new_lines.append(f"{ignoreip_line}\n")
-                ignoreip_updated = True
-            else:
-                new_lines.append(line)
+            content = ""
         
-        if in_default and not ignoreip_updated:
-            new_lines.append(f"{ignoreip_line}\n")
+        content = _set_default_ignoreip(content, ignoreip_line)
         
         with open(JAIL_LOCAL, 'w') as f:
-            f.writelines(new_lines)
+            f.write(content)
         
         return True
     except Exception as e:
@@ -898,47 +909,256 @@ def _apply_whitelist_to_fail2ban():
         return False
 
 
-def _load_whitelist():
-    """Load whitelist from file."""
-    ensure_data_dir()
-    if not WHITELIST_FILE.exists():
-        return {}
-    try:
-        with open(WHITELIST_FILE, 'r') as f:
-            return json.load(f)
-    except Exception:
-        return {}
+def _set_default_ignoreip(content, ignoreip_line):
+    """
+    Set ignoreip in the [DEFAULT] section of jail.local content.
+    
+    Single pass over the lines: an existing ignoreip (and its indented
+    continuation lines) is replaced, otherwise the line is appended at the
+    end of [DEFAULT]. The section is created if the file has none.
+    """
+    ignoreip = f"{ignoreip_line}\n"
+    new_lines = []
+    has_default = False
+    in_default = False
+    in_ignoreip = False
+    ignoreip_updated = False
+    
+    for line in content.splitlines(keepends=True):
+        if in_ignoreip and line[:1] in ' \t' and not line.isspace():
+            continue
+        in_ignoreip = False
+        
+        section = _SECTION_RE.match(line)
+        if section:
+            if in_default and not ignoreip_updated:
+                new_lines.append(ignoreip)
+                ignoreip_updated = True
+            in_default = section.group(1) == 'DEFAULT'
+            has_default = has_default or in_default
+        elif in_default and _IGNOREIP_RE.match(line):
+            new_lines.append(ignoreip)
+            ignoreip_updated = True
+            in_ignoreip = True
+            continue
+        
+        new_lines.append(line)
+    
+    if new_lines and not new_lines[-1].endswith('\n'):
+        new_lines[-1] += '\n'
+    
+    if not has_default:
+        new_lines.insert(0, f"[DEFAULT]\n{ignoreip}\n" if new_lines else f"[DEFAULT]\n{ignoreip}")
+    elif in_default and not ignoreip_updated:
+        new_lines.append(ignoreip)
+    
+    return "".join(new_lines)
 
 
-def _save_whitelist(whitelist):
-    """Save whitelist to file."""
-    ensure_data_dir()
+def _collect_entries(whitelist):
+    """Collect every whitelisted IP/range, including the loopback defaults."""
+    global_wl = whitelist.get('global', {})
+    groups = whitelist.get('groups', {})
+    
+    all_ips = set(DEFAULT_IGNORE)
+    all_ips.update(global_wl.get('ips', {}), global_wl.get('ranges', {}))
+    all_ips.update(*(
+        groups.get(name, {}).get('entries', [])
+        for name in global_wl.get('groups', [])
+    ))
+    all_ips.update(*(
+        data.get('entries', [])
+        for data in whitelist.get('trusted_ips', {}).values()
+    ))
+    
+    return all_ips
+
+
+def _build_lookup(entries):
+    """Collapse entries into sorted (starts, ends) address ranges per IP version."""
+    networks = {4: [], 6: []}
+    for entry in entries:
+        try:
+            network = ipaddress.ip_network(entry, strict=False)
+        except ValueError:
+            continue
+        networks[network.version].append(network)
+    
+    ranges = {}
+    for version, nets in networks.items():
+        collapsed = list(ipaddress.collapse_addresses(nets))
+        ranges[version] = (
+            [int(n.network_address) for n in collapsed],
+            [int(n.broadcast_address) for n in collapsed],
+        )
+    return ranges
+
+
+def is_whitelisted(ip):
+    """
+    Check if an IP is covered by the whitelist applied to ignoreip.
+    
+    Ranges are collapsed and sorted once per whitelist file change, so a
+    lookup is a binary search instead of a scan over every entry.
+    
+    Args:
+        ip: IP address string
+    
+    Returns:
+        bool: True if the IP is whitelisted
+    """
     try:
-        with open(WHITELIST_FILE, 'w') as f:
-            json.dump(whitelist, f, indent=2)
-        return True
-    except Exception:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
         return False
+    
+    try:
+        mtime = WHITELIST_FILE.stat().st_mtime
+    except OSError:
+        mtime = None
+    
+    if _LOOKUP_CACHE['ranges'] is None or _LOOKUP_CACHE['mtime'] != mtime:
+        _LOOKUP_CACHE['ranges'] = _build_lookup(_collect_entries(_load_whitelist()))
+        _LOOKUP_CACHE['mtime'] = mtime
+    
+    starts, ends = _LOOKUP_CACHE['ranges'][addr.version]
+    value = int(addr)
+    idx = bisect.bisect_right(starts, value) - 1
+    return idx >= 0 and value <= ends[idx]
 
 
-def _load_trusted_sources():
-    """Load trusted sources config."""
+def _json_loads(raw):
+    """Parse JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps(data):
+    """Serialize data to indented JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _load_json(path, for_update=False):
+    """
+    Load a JSON data file, reusing the parsed data while the file is unchanged.
+    
+    Read-only callers share the cached object and must not modify it.
+    Callers that change the data pass for_update=True and get their own
+    copy, so changes that are never saved (e.g. an edit abandoned halfway)
+    do not leak into later loads.
+    """
     ensure_data_dir()
-    if not TRUSTED_SOURCES_FILE.exists():
+    try:
+        stat = path.stat()
+    except OSError:
         return {}
+    
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _JSON_CACHE.get(path)
+    if not cached or cached[0] != key:
+        try:
+            content = path.read_bytes()
+            data = _json_loads(content)
+        except Exception:
+            return {}
+        cached = _JSON_CACHE[path] = (key, data, content)
+    
+    return copy.deepcopy(cached[1]) if for_update else cached[1]
+
+
+def _write_atomic(path, content):
+    """
+    Write bytes to a temporary file next to path, then rename it over path.
+    
+    Readers see either the old or the new file, never a partial write.
+    """
+    tmp = f"{path}.tmp"
     try:
-        with open(TRUSTED_SOURCES_FILE, 'r') as f:
-            return json.load(f)
+        with open(tmp, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
     except Exception:
-        return {}
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
 
 
-def _save_trusted_sources(trusted):
-    """Save trusted sources config."""
+def _save_json(path, data):
+    """
+    Save a JSON data file and keep the in-memory copy in sync.
+    
+    The write is skipped when the serialized data matches what is already
+    on disk.
+    """
     ensure_data_dir()
     try:
-        with open(TRUSTED_SOURCES_FILE, 'w') as f:
-            json.dump(trusted, f, indent=2)
-        return True
+        content = _json_dumps(data)
+        cached = _JSON_CACHE.get(path)
+        if cached and cached[2] == content:
+            stat = path.stat()
+            if cached[0] == (stat.st_mtime_ns, stat.st_size):
+                return True
+        
+        _write_atomic(path, content)
+        stat = path.stat()
     except Exception:
+        _JSON_CACHE.pop(path, None)
         return False
+    
+    # The caller may go on changing data, so cache a copy of what was written
+    _JSON_CACHE[path] = ((stat.st_mtime_ns, stat.st_size), _json_loads(content), content)
+    return True
+
+
+def _normalize_whitelist(whitelist):
+    """
+    Index global IPs and ranges by value.
+    
+    Older whitelist files store them as lists of plain strings or
+    {'value', 'description', 'added'} dicts; those are converted in place
+    to {value: {'description', 'added'}} so lookups and removals are O(1).
+    """
+    global_wl = whitelist.get('global')
+    if not global_wl:
+        return whitelist
+    
+    for kind in ('ips', 'ranges'):
+        entries = global_wl.get(kind)
+        if not isinstance(entries, list):
+            continue
+        
+        indexed = {}
+        for entry in entries:
+            if isinstance(entry, dict):
+                value = entry.get('value')
+                meta = {k: v for k, v in entry.items() if k != 'value'}
+            else:
+                value, meta = entry, {}
+            if value:
+                indexed.setdefault(value, meta)
+        global_wl[kind] = indexed
+    
+    return whitelist
+
+
+def _load_whitelist(for_update=False):
+    """Load whitelist from file; see _load_json() for for_update."""
+    return _normalize_whitelist(_load_json(WHITELIST_FILE, for_update))
+
+
+def _save_whitelist(whitelist):
+    """Save whitelist to file."""
+    return _save_json(WHITELIST_FILE, whitelist)
+
+
+def _load_trusted_sources(for_update=False):
+    """Load trusted sources config; see _load_json() for for_update."""
+    return _load_json(TRUSTED_SOURCES_FILE, for_update)
+
+
+def _save_trusted_sources(trusted):
+    """Save trusted sources config."""
+    return _save_json(TRUSTED_SOURCES_FILE, trusted)
@@ -4,54 +4,107 @@ from ui.menu import run_menu_loop
 from modules.firewall.common import is_ufw_installed, get_ufw_status_text
 
 
+_BACK_OPTION = ("back", "← Back to Main Menu")
+
+# Menu options only depend on whether UFW is installed
+_INSTALLED_OPTIONS = (
+    ("status", "1. Status Dashboard"),
+    ("enable", "2. Enable Firewall"),
+    ("disable", "3. Disable Firewall"),
+    ("ports", "4. Port Management"),
+    ("ip", "5. IP Management"),
+    ("rate", "6. Rate Limiting"),
+    ("profiles", "7. Application Profiles"),
+    ("logs", "8. Logs & Monitoring"),
+    ("backup", "9. Backup & Restore"),
+    _BACK_OPTION,
+)
+
+_INSTALL_OPTIONS = (
+    ("install", "1. Install UFW"),
+    _BACK_OPTION,
+)
+
+
 def show_menu():
     """Display the Firewall (UFW) main menu."""
-    from modules.firewall.status import show_status_dashboard
-    from modules.firewall.quick_setup import (
-        install_ufw,
-        enable_firewall,
-        disable_firewall,
-    )
-    from modules.firewall.ports import show_ports_menu
-    from modules.firewall.ip_management import show_ip_menu
-    from modules.firewall.rate_limiting import show_rate_limit_menu
-    from modules.firewall.profiles import show_profiles_menu
-    from modules.firewall.logs import show_logs_menu
-    from modules.firewall.backup import show_backup_menu
-    
     def get_status():
         return f"UFW Status: {get_ufw_status_text()}"
     
     def get_options():
-        options = []
-        if is_ufw_installed():
-            options.extend([
-                ("status", "1. Status Dashboard"),
-                ("enable", "2. Enable Firewall"),
-                ("disable", "3. Disable Firewall"),
-                ("ports", "4. Port Management"),
-                ("ip", "5. IP Management"),
-                ("rate", "6. Rate Limiting"),
-                ("profiles", "7. Application Profiles"),
-                ("logs", "8. Logs & Monitoring"),
-                ("backup", "9. Backup & Restore"),
-            ])
-        else:
-            options.append(("install", "1. Install UFW"))
-        options.append(("back", "← Back to Main Menu"))
-        return options
+        return _INSTALLED_OPTIONS if is_ufw_installed() else _INSTALL_OPTIONS
     
     handlers = {
-        "install": install_ufw,
-        "status": show_status_dashboard,
-        "enable": enable_firewall,
-        "disable": disable_firewall,
-        "ports": show_ports_menu,
-        "ip": show_ip_menu,
-        "rate": show_rate_limit_menu,
-        "profiles": show_profiles_menu,
-        "logs": show_logs_menu,
-        "backup": show_backup_menu,
+        "install": _install_handler,
+        "status": _status_handler,
+        "enable": _enable_handler,
+        "disable": _disable_handler,
+        "ports": _ports_handler,
+        "ip": _ip_handler,
+        "rate": _rate_handler,
+        "profiles": _profiles_handler,
+        "logs": _logs_handler,
+        "backup": _backup_handler,
     }
     
     run_menu_loop("Firewall (UFW)", get_options, handlers, get_status)
+
+
+def _install_handler():
+    """Handle install menu option."""
+    from modules.firewall.quick_setup import install_ufw
+    install_ufw()
+
+
+def _status_handler():
+    """Handle status dashboard menu option."""
+    from modules.firewall.status import show_status_dashboard
+    show_status_dashboard()
+
+
+def _enable_handler():
+    """Handle enable firewall menu option."""
+    from modules.firewall.quick_setup import enable_firewall
+    enable_firewall()
+
+
+def _disable_handler():
+    """Handle disable firewall menu option."""
+    from modules.firewall.quick_setup import disable_firewall
+    disable_firewall()
+
+
+def _ports_handler():
+    """Handle port management menu option."""
+    from modules.firewall.ports import show_ports_menu
+    show_ports_menu()
+
+
+def _ip_handler():
+    """Handle IP management menu option."""
+    from modules.firewall.ip_management import show_ip_menu
+    show_ip_menu()
+
+
+def _rate_handler():
+    """Handle rate limiting menu option."""
+    from modules.firewall.rate_limiting import show_rate_limit_menu
+    show_rate_limit_menu()
+
+
+def _profiles_handler():
+    """Handle application profiles menu option."""
+    from modules.firewall.profiles import show_profiles_menu
+    show_profiles_menu()
+
+
+def _logs_handler():
+    """Handle logs menu option."""
+    from modules.firewall.logs import show_logs_menu
+    show_logs_menu()
+
+
+def _backup_handler():
+    """Handle backup menu option."""
+    from modules.firewall.backup import show_backup_menu
+    show_backup_menu()
@@ -2,7 +2,9 @@
 
 import os
 import json
+import re
 import socket
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from ui.components import (
     console,
@@ -16,10 +18,11 @@ from ui.components import (
     press_enter_to_continue,
 )
 from ui.menu import run_menu_loop, text_input, select_from_list, confirm_action
-from utils.shell import run_command, require_root
+from utils.shell import require_root
 from utils.error_handler import handle_error
 from modules.firewall.common import (
     is_ufw_installed,
+    run_ufw_batch,
     get_ufw_status_text,
     get_ufw_rules,
     get_ufw_defaults,
@@ -29,15 +32,60 @@ from modules.firewall.common import (
     save_rate_limits,
     ensure_config_dir,
     VEXO_FIREWALL_BACKUPS,
+    BACKUPS_INDEX_FILE,
     SETTINGS_FILE,
 )
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+# Automatic backups are only read back by vexo, so they use MessagePack
+# when it is installed; backups made from the menu stay readable JSON.
+# .msgpack files are always listed so they do not vanish without msgpack.
+_BACKUP_EXTENSIONS = (".json", ".msgpack")
+_AUTO_BACKUP_EXTENSION = ".msgpack" if HAS_MSGPACK else ".json"
+
+
+# Parsed backup list, reused while the backups directory mtime is unchanged
+_BACKUPS_CACHE = {"mtime": None, "data": None, "index": None}
+
+# Menu status line, recomputed only after something marked it dirty
+_STATUS_CACHE = {"dirty": True, "text": None}
+
+# Fields shown in backup listings; written ahead of the rule data
+_HEADER_FIELDS = ("name", "created", "description", "rule_count")
+_HEADER_READ_SIZE = 4096
+_WS_RE = re.compile(r'[ \t\n\r]*')
+
+# Fields every backups index entry must have to be reused
+_INDEX_FIELDS = _HEADER_FIELDS + ("mtime", "size")
+
+# Recorded in every backup; looked up once instead of per backup
+_HOSTNAME = socket.gethostname()
+
+# Characters replaced by "-" when a backup name becomes a filename
+_SAFE_RE = re.compile(r'[^A-Za-z0-9_-]')
+
 
 def show_backup_menu():
     """Display backup and restore submenu."""
     def get_status():
-        backups = _list_backups()
-        return f"UFW: {get_ufw_status_text()} | Backups: {len(backups)}"
+        if _STATUS_CACHE["dirty"]:
+            _STATUS_CACHE["text"] = f"UFW: {get_ufw_status_text()} | Backups: {len(_list_backups())}"
+            _STATUS_CACHE["dirty"] = False
+        return _STATUS_CACHE["text"]
+    
+    # Other menus may have changed UFW since this menu was last open
+    _STATUS_CACHE["dirty"] = True
     
     options = [
         ("create", "1. Create Backup"),
@@ -59,32 +107,278 @@ def show_backup_menu():
     run_menu_loop("Backup & Restore", options, handlers, get_status)
 
 
+def _invalidate_backups_cache():
+    """Forget the cached backup list after a backup file was written or removed."""
+    _BACKUPS_CACHE["mtime"] = None
+    _STATUS_CACHE["dirty"] = True
+
+
 def _list_backups():
-    """List all backup files."""
-    if not os.path.exists(VEXO_FIREWALL_BACKUPS):
+    """
+    List all backup files.
+    
+    The parsed list is reused while the backups directory is unchanged;
+    write paths also call _invalidate_backups_cache() because rewriting an
+    existing file does not change the directory mtime. Across sessions,
+    headers come from the backups index and a file is only read again when
+    its mtime or size differs from the indexed one.
+    """
+    try:
+        mtime = os.stat(VEXO_FIREWALL_BACKUPS).st_mtime_ns
+    except OSError:
         return []
     
-    backups = []
-    for filename in os.listdir(VEXO_FIREWALL_BACKUPS):
-        if filename.endswith('.json'):
-            filepath = os.path.join(VEXO_FIREWALL_BACKUPS, filename)
+    if _BACKUPS_CACHE["mtime"] == mtime:
+        return list(_BACKUPS_CACHE["data"])
+    
+    # Per-file headers stay valid while a file's mtime and size match, so
+    # the index loaded earlier in this session is reused as is
+    index = _BACKUPS_CACHE["index"]
+    if index is None:
+        index = _load_backups_index()
+    new_index = {}
+    stale = []
+    with os.scandir(VEXO_FIREWALL_BACKUPS) as entries:
+        for entry in entries:
+            if not entry.name.endswith(_BACKUP_EXTENSIONS):
+                continue
             try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    backups.append({
-                        "filename": filename,
-                        "filepath": filepath,
-                        "name": data.get("name", filename),
-                        "created": data.get("created", "unknown"),
-                        "description": data.get("description", ""),
-                        "rule_count": len(data.get("ufw_rules", []))
-                    })
-            except (json.JSONDecodeError, IOError):
+                stat = entry.stat()
+            except OSError:
                 continue
+            
+            cached = index.get(entry.name)
+            if cached and cached.get("mtime") == stat.st_mtime_ns and cached.get("size") == stat.st_size:
+                new_index[entry.name] = cached
+            else:
+                stale.append((entry.name, entry.path, stat))
+    
+    # Headers of new or changed files are independent reads: fan them out
+    if len(stale) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1, len(stale))) as executor:
+            headers = list(executor.map(_try_read_backup_header, [path for _, path, _ in stale]))
+    else:
+        headers = [_try_read_backup_header(path) for _, path, _ in stale]
+    
+    unreadable = []
+    for (filename, filepath, stat), header in zip(stale, headers):
+        if header is None:
+            if filename.endswith(".msgpack") and not HAS_MSGPACK:
+                # Listed but not indexed, so it is read once msgpack is installed
+                unreadable.append({
+                    "filename": filename,
+                    "filepath": filepath,
+                    "name": os.path.splitext(filename)[0],
+                    "created": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    "description": "msgpack required to read this backup",
+                    "rule_count": 0,
+                })
+            continue
+        new_index[filename] = {
+            "name": header.get("name", filename),
+            "created": header.get("created", "unknown"),
+            "description": header.get("description", ""),
+            "rule_count": header["rule_count"],
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+    
+    backups = [
+        {
+            "filename": filename,
+            "filepath": os.path.join(VEXO_FIREWALL_BACKUPS, filename),
+            "name": info["name"],
+            "created": info["created"],
+            "description": info["description"],
+            "rule_count": info["rule_count"],
+        }
+        for filename, info in new_index.items()
+    ]
+    backups.extend(unreadable)
+    
+    if new_index != index:
+        _save_backups_index(new_index)
+    _BACKUPS_CACHE["index"] = new_index
     
     # Sort by creation date (newest first)
     backups.sort(key=lambda x: x["created"], reverse=True)
-    return backups
+    
+    _BACKUPS_CACHE["mtime"] = mtime
+    _BACKUPS_CACHE["data"] = backups
+    return list(backups)
+
+
+def _read_json(path):
+    """Read and parse a JSON file, using orjson when available."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _write_json(path, data, indent=True):
+    """
+    Write data to a JSON file, using orjson when available.
+    
+    Without orjson the encoder output is streamed into the file piece by
+    piece instead of being joined into one string first.
+    """
+    if HAS_ORJSON:
+        chunks = (orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0),)
+    else:
+        encoder = json.JSONEncoder(indent=2 if indent else None)
+        chunks = (chunk.encode('utf-8') for chunk in encoder.iterencode(data))
+    _write_atomic(path, chunks)
+
+
+def _write_atomic(path, chunks):
+    """
+    Write bytes to path through a synced temporary file.
+    
+    The temporary file is renamed over path, so a crash mid-write never
+    leaves a truncated backup behind.
+    
+    Args:
+        path: Destination file
+        chunks: Iterable of bytes objects, written in order
+    """
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        # chunks may be encoded lazily, so a serialization error can also
+        # surface here
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _read_backup(path):
+    """Read a backup file, JSON or MessagePack depending on its extension."""
+    if path.endswith(".msgpack"):
+        if not HAS_MSGPACK:
+            raise IOError("msgpack is required to read this backup (pip install msgpack)")
+        with open(path, 'rb') as f:
+            return msgpack.unpackb(f.read(), raw=False)
+    return _read_json(path)
+
+
+def _write_backup(path, data):
+    """Write a backup file, JSON or MessagePack depending on its extension."""
+    if path.endswith(".msgpack"):
+        _write_atomic(path, (msgpack.packb(data, use_bin_type=True),))
+    else:
+        _write_json(path, data)
+
+
+def _load_backups_index():
+    """
+    Load the saved backup listing: filename -> header fields plus mtime/size.
+    
+    Malformed entries are dropped, so their files are read again.
+    """
+    try:
+        index = _read_json(BACKUPS_INDEX_FILE)
+    except (json.JSONDecodeError, IOError):
+        return {}
+    if not isinstance(index, dict):
+        return {}
+    return {
+        filename: info
+        for filename, info in index.items()
+        if isinstance(info, dict) and all(key in info for key in _INDEX_FIELDS)
+    }
+
+
+def _save_backups_index(index):
+    """Save the backup listing; a failed write only costs a re-read next time."""
+    try:
+        _write_json(BACKUPS_INDEX_FILE, index, indent=False)
+    except IOError:
+        pass
+
+
+def _parse_backup_header(text):
+    """
+    Decode top-level fields of a backup until all header fields are known.
+    
+    Backups written with a "rule_count" field before "ufw_rules" are
+    answered without decoding the rule list.
+    
+    Returns:
+        dict: Decoded fields; raises ValueError if text ends before that
+    """
+    decoder = json.JSONDecoder()
+    fields = {}
+    idx = _WS_RE.match(text, 0).end()
+    if text[idx:idx + 1] != '{':
+        raise ValueError("backup is not a JSON object")
+    idx = _WS_RE.match(text, idx + 1).end()
+    
+    while text[idx:idx + 1] != '}':
+        key, idx = decoder.raw_decode(text, idx)
+        idx = _WS_RE.match(text, idx).end()
+        if text[idx:idx + 1] != ':':
+            raise ValueError("expected ':' in backup")
+        idx = _WS_RE.match(text, idx + 1).end()
+        fields[key], idx = decoder.raw_decode(text, idx)
+        
+        # A value is only complete once its delimiter follows: a read that
+        # stops inside a number would otherwise decode a truncated value
+        idx = _WS_RE.match(text, idx).end()
+        delimiter = text[idx:idx + 1]
+        if delimiter not in (',', '}'):
+            raise ValueError("expected ',' or '}' in backup")
+        
+        if all(k in fields for k in _HEADER_FIELDS):
+            return fields
+        
+        if delimiter == ',':
+            idx = _WS_RE.match(text, idx + 1).end()
+    
+    fields["rule_count"] = len(fields.get("ufw_rules", []))
+    return fields
+
+
+def _try_read_backup_header(filepath):
+    """Read a backup's header, or None if the file is unreadable or invalid."""
+    try:
+        return _read_backup_header(filepath)
+    except (ValueError, IOError):
+        return None
+
+
+def _read_backup_header(filepath):
+    """
+    Read the listing fields of a backup file.
+    
+    Only the start of a JSON file is read when it holds the whole header;
+    older backups without "rule_count" are read and decoded in full.
+    MessagePack backups are compact and decoded whole.
+    """
+    if filepath.endswith(".msgpack"):
+        data = _read_backup(filepath)
+        if not isinstance(data, dict):
+            raise ValueError("backup is not a mapping")
+        header = {field: data[field] for field in _HEADER_FIELDS if field in data}
+        header["rule_count"] = len(data.get("ufw_rules", []))
+        return header
+    
+    with open(filepath, 'r') as f:
+        text = f.read(_HEADER_READ_SIZE)
+        try:
+            return _parse_backup_header(text)
+        except ValueError:
+            text += f.read()
+    return _parse_backup_header(text)
 
 
 def _get_current_config():
@@ -123,7 +417,7 @@ def create_backup():
         return
     
     # Sanitize name for filename
-    safe_name = "".join(c if c.isalnum() or c in "-_" else "-" for c in name)
+    safe_name = _SAFE_RE.sub("-", name)
     
     # Description
     description = text_input(
@@ -150,8 +444,9 @@ def create_backup():
         "version": "1.0",
         "name": name,
         "created": datetime.now().isoformat(),
-        "server": socket.gethostname(),
+        "server": _HOSTNAME,
         "description": description,
+        "rule_count": len(config["ufw_rules"]) if include_rules else 0,
     }
     
     if include_rules:
@@ -170,8 +465,8 @@ def create_backup():
     filepath = os.path.join(VEXO_FIREWALL_BACKUPS, filename)
     
     try:
-        with open(filepath, 'w') as f:
-            json.dump(backup_data, f, indent=2)
+        _write_json(filepath, backup_data)
+        _invalidate_backups_cache()
         
         show_success(f"Backup created: {filename}")
         console.print()
@@ -215,9 +510,8 @@ def restore_backup():
     
     # Load backup data
     try:
-        with open(backup["filepath"], 'r') as f:
-            backup_data = json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
+        backup_data = _read_backup(backup["filepath"])
+    except (ValueError, IOError) as e:
         handle_error("E6001", f"Failed to load backup: {e}")
         press_enter_to_continue()
         return
@@ -273,9 +567,10 @@ def restore_backup():
     _auto_backup("pre-restore")
     
     # Restore UFW rules
+    rules_ok = True
     if has_rules:
         show_info("Restoring UFW rules...")
-        _restore_ufw_rules(backup_data["ufw_rules"], backup_data.get("ufw_defaults", {}))
+        rules_ok = _restore_ufw_rules(backup_data["ufw_rules"], backup_data.get("ufw_defaults", {}))
     
     # Restore IP groups
     if has_ip_groups:
@@ -288,23 +583,32 @@ def restore_backup():
         save_rate_limits(backup_data["rate_limits"])
     
     console.print()
-    show_success("Backup restored successfully!")
+    if rules_ok:
+        show_success("Backup restored successfully!")
+    else:
+        show_warning("Backup restored, but some UFW commands failed. Check the rules above.")
     
     press_enter_to_continue()
 
 
 def _restore_ufw_rules(rules, defaults):
-    """Restore UFW rules from backup."""
-    # Reset UFW
-    run_command("ufw --force reset", check=False, silent=True)
-    
-    # Set defaults
-    if defaults.get("incoming"):
-        run_command(f"ufw default {defaults['incoming']} incoming", check=False, silent=True)
-    if defaults.get("outgoing"):
-        run_command(f"ufw default {defaults['outgoing']} outgoing", check=False, silent=True)
+    """
+    Restore UFW rules from backup.
+    
+    Returns:
+        bool: True if every ufw command succeeded
+    """
+    # Reset UFW and set defaults
+    commands = ["ufw --force reset"]
+    for direction in ("incoming", "outgoing"):
+        # Backups record "unknown" when the policy could not be read
+        policy = defaults.get(direction)
+        if policy in ("allow", "deny", "reject"):
+            commands.append(f"ufw default {policy} {direction}")
     
     # Add rules
+    first_rule = len(commands)
+    restored = []
     for rule in rules:
         rule_str = rule.get("rule", "")
         
@@ -324,15 +628,22 @@ def _restore_ufw_rules(rules, defaults):
         parts = rule_str.split()
         if parts:
             port_proto = parts[0]
-            cmd = f"ufw {action} {port_proto}"
-            result = run_command(cmd, check=False, silent=True)
-            if result.returncode == 0:
-                console.print(f"  [green]✓[/green] {action} {port_proto}")
-            else:
-                console.print(f"  [red]✗[/red] {action} {port_proto}")
+            commands.append(f"ufw {action} {port_proto}")
+            restored.append((action, port_proto))
     
     # Enable UFW
-    run_command("ufw --force enable", check=False, silent=True)
+    commands.append("ufw --force enable")
+    
+    results = run_ufw_batch(commands)
+    _STATUS_CACHE["dirty"] = True
+    
+    for (action, port_proto), ok in zip(restored, results[first_rule:-1]):
+        if ok:
+            console.print(f"  [green]✓[/green] {action} {port_proto}")
+        else:
+            console.print(f"  [red]✗[/red] {action} {port_proto}")
+    
+    return all(results)
 
 
 def _auto_backup(prefix="auto"):
@@ -340,25 +651,27 @@ def _auto_backup(prefix="auto"):
     ensure_config_dir()
     
     config = _get_current_config()
+    now = datetime.now()
     
     backup_data = {
         "version": "1.0",
-        "name": f"{prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
-        "created": datetime.now().isoformat(),
-        "server": socket.gethostname(),
+        "name": f"{prefix}-{now.strftime('%Y%m%d-%H%M%S')}",
+        "created": now.isoformat(),
+        "server": _HOSTNAME,
         "description": f"Automatic backup ({prefix})",
+        "rule_count": len(config["ufw_rules"]),
         "ufw_rules": config["ufw_rules"],
         "ufw_defaults": config["ufw_defaults"],
         "ip_groups": config["ip_groups"],
         "rate_limits": config["rate_limits"]
     }
     
-    filename = f"{backup_data['name']}.json"
+    filename = f"{backup_data['name']}{_AUTO_BACKUP_EXTENSION}"
     filepath = os.path.join(VEXO_FIREWALL_BACKUPS, filename)
     
     try:
-        with open(filepath, 'w') as f:
-            json.dump(backup_data, f, indent=2)
+        _write_backup(filepath, backup_data)
+        _invalidate_backups_cache()
         return filepath
     except IOError:
         return None
@@ -416,8 +729,7 @@ def compare_configs():
         else:
             idx = options.index(choice)
             backup = backups[idx]
-            with open(backup["filepath"], 'r') as f:
-                return json.load(f), backup["name"]
+            return _read_backup(backup["filepath"]), backup["name"]
     
     try:
         config1, name1 = load_config(choice1)
@@ -432,11 +744,13 @@ def compare_configs():
     show_header()
     show_panel(f"Comparing: {name1} vs {name2}", title="Config Comparison", style="cyan")
     
-    rules1 = set(r.get("rule", "") for r in config1.get("ufw_rules", []))
-    rules2 = set(r.get("rule", "") for r in config2.get("ufw_rules", []))
+    # dict keys keep the rule order of each config, so the diff lists rules
+    # in firewall order instead of set iteration order
+    rules1 = dict.fromkeys(r.get("rule", "") for r in config1.get("ufw_rules", []))
+    rules2 = dict.fromkeys(r.get("rule", "") for r in config2.get("ufw_rules", []))
     
-    added = rules2 - rules1
-    removed = rules1 - rules2
+    added = [rule for rule in rules2 if rule not in rules1]
+    removed = [rule for rule in rules1 if rule not in rules2]
     
     # Display comparison
     console.print(f"[bold]Rules in {name1}:[/bold] {len(rules1)}")
@@ -445,7 +759,7 @@ def compare_configs():
     
     if added:
         console.print(f"[green bold]Added in {name2} (+{len(added)}):[/green bold]")
-        for rule in list(added)[:10]:
+        for rule in added[:10]:
             console.print(f"  [green]+[/green] {rule}")
         if len(added) > 10:
             console.print(f"  [dim]... and {len(added) - 10} more[/dim]")
@@ -453,7 +767,7 @@ def compare_configs():
     
     if removed:
         console.print(f"[red bold]Removed from {name1} (-{len(removed)}):[/red bold]")
-        for rule in list(removed)[:10]:
+        for rule in removed[:10]:
             console.print(f"  [red]-[/red] {rule}")
         if len(removed) > 10:
             console.print(f"  [dim]... and {len(removed) - 10} more[/dim]")
@@ -552,8 +866,7 @@ def _load_settings():
         }
     
     try:
-        with open(SETTINGS_FILE, 'r') as f:
-            return json.load(f)
+        return _read_json(SETTINGS_FILE)
     except (json.JSONDecodeError, IOError):
         return {}
 
@@ -561,26 +874,39 @@ def _load_settings():
 def _save_settings(settings):
     """Save backup settings."""
     ensure_config_dir()
-    with open(SETTINGS_FILE, 'w') as f:
-        json.dump(settings, f, indent=2)
+    _write_json(SETTINGS_FILE, settings)
 
 
 def _cleanup_old_backups(keep_n):
-    """Delete old backups, keeping only the last N."""
-    backups = _list_backups()
+    """
+    Delete old backups, keeping only the last N.
     
+    Only the directory is scanned: filenames carry the backup name and the
+    file mtime orders them, so no backup has to be opened or parsed.
+    """
     # Keep system backups (pre-restore, etc.) separately
-    auto_backups = [b for b in backups if b["name"].startswith("auto-") or b["name"].startswith("backup-")]
+    try:
+        with os.scandir(VEXO_FIREWALL_BACKUPS) as entries:
+            auto_backups = []
+            for entry in entries:
+                if entry.name.endswith(_BACKUP_EXTENSIONS) and entry.name.startswith(("auto-", "backup-")):
+                    try:
+                        auto_backups.append((entry.stat().st_mtime_ns, entry.path))
+                    except OSError:
+                        pass
+    except OSError:
+        return 0
     
     deleted = 0
     if len(auto_backups) > keep_n:
-        to_delete = auto_backups[keep_n:]
-        for backup in to_delete:
+        auto_backups.sort(reverse=True)
+        for _, filepath in auto_backups[keep_n:]:
             try:
-                os.remove(backup["filepath"])
+                os.remove(filepath)
                 deleted += 1
             except IOError:
                 pass
+        _invalidate_backups_cache()
     
     return deleted
 
@@ -672,8 +998,7 @@ def manage_backups():
 def _view_backup_details(backup):
     """View detailed backup information."""
     try:
-        with open(backup["filepath"], 'r') as f:
-            data = json.load(f)
+        data = _read_backup(backup["filepath"])
     except Exception as e:
         handle_error("E6001", f"Failed to load backup: {e}")
         return
@@ -697,21 +1022,24 @@ def _rename_backup(backup, new_name):
     """Rename a backup."""
     try:
         # Load and update data
-        with open(backup["filepath"], 'r') as f:
-            data = json.load(f)
+        data = _read_backup(backup["filepath"])
+        stat = os.stat(backup["filepath"])
         
         data["name"] = new_name
         
         # Save with new filename
-        safe_name = "".join(c if c.isalnum() or c in "-_" else "-" for c in new_name)
-        new_filepath = os.path.join(VEXO_FIREWALL_BACKUPS, f"{safe_name}.json")
+        safe_name = _SAFE_RE.sub("-", new_name)
+        extension = os.path.splitext(backup["filepath"])[1]
+        new_filepath = os.path.join(VEXO_FIREWALL_BACKUPS, f"{safe_name}{extension}")
         
-        with open(new_filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        _write_backup(new_filepath, data)
+        # Keep the original times: retention orders backups by mtime
+        os.utime(new_filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
         
         # Remove old file if different
         if new_filepath != backup["filepath"]:
             os.remove(backup["filepath"])
+        _invalidate_backups_cache()
         
         show_success(f"Backup renamed to '{new_name}'.")
     except Exception as e:
@@ -722,11 +1050,46 @@ def _delete_backup(backup):
     """Delete a backup."""
     try:
         os.remove(backup["filepath"])
+        _invalidate_backups_cache()
         show_success(f"Backup '{backup['name']}' deleted.")
     except IOError as e:
         handle_error("E6001", f"Failed to delete: {e}")
 
 
+def _copy_file(src, dst):
+    """
+    Copy a file with its metadata, in-kernel where possible.
+    
+    os.copy_file_range lets the kernel copy (or reflink) the data without
+    passing it through userspace; other filesystems and kernels without it
+    fall back to shutil.copyfileobj.
+    
+    Returns:
+        str: Path of the written copy
+    """
+    import shutil
+    
+    # Like shutil.copy2, copy into a destination directory under the same name
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst)
+    shutil.copystat(src, dst)
+    return dst
+
+
 def _export_backup(backup):
     """Export backup to a different location."""
     dest = text_input(
@@ -739,8 +1102,7 @@ def _export_backup(backup):
         return
     
     try:
-        import shutil
-        shutil.copy2(backup["filepath"], dest)
+        dest = _copy_file(backup["filepath"], dest)
         show_success(f"Exported to: {dest}")
     except Exception as e:
         handle_error("E6001", f"Failed to export: {e}")
@@ -1,96 +1,349 @@
 """Common utilities for firewall module."""
 
+import fcntl
 import json
 import os
 import re
-from utils.shell import run_command, is_installed
+import time
+from contextlib import contextmanager
+from ipaddress import ip_network
+from utils.shell import run_command, iter_command_lines
 
 
 # Config paths
 VEXO_FIREWALL_DIR = "/etc/vexo/firewall"
 VEXO_FIREWALL_BACKUPS = f"{VEXO_FIREWALL_DIR}/backups"
+BACKUPS_INDEX_FILE = f"{VEXO_FIREWALL_DIR}/backups-index.json"
 IP_GROUPS_FILE = f"{VEXO_FIREWALL_DIR}/ip-groups.json"
 RATE_LIMITS_FILE = f"{VEXO_FIREWALL_DIR}/rate-limits.json"
 SETTINGS_FILE = f"{VEXO_FIREWALL_DIR}/settings.json"
+UFW_BIN = "/usr/sbin/ufw"
+UFW_CONF_FILE = "/etc/ufw/ufw.conf"
+UFW_DEFAULTS_FILE = "/etc/default/ufw"
+UFW_USER_RULES_FILES = ("/etc/ufw/user.rules", "/etc/ufw/user6.rules")
+UFW_LOCK_FILE = "/run/vexo-ufw.lock"
+UFW_LOCK_FALLBACK = "/tmp/vexo-ufw.lock"
+
+# Seconds a `ufw status` probe is reused across menu redraws
+UFW_STATUS_TTL = 2
+
+# One numbered rule line of `ufw status numbered`, e.g. "[ 3] 80/tcp  ALLOW IN  Anywhere"
+_RULE_RE = re.compile(r'^[ \t]*\[[ \t]*(\d+)\][ \t]+(.+?)[ \t]*$', re.M)
+
+# The "Default:" line of `ufw status verbose`
+_DEFAULT_LINE_RE = re.compile(r'^default:(.*)$', re.M | re.I)
+
+# One policy on that line, e.g. "deny (incoming)"
+_DEFAULT_POLICY_RE = re.compile(r'(\w+)\s*\((incoming|outgoing|routed)\)', re.I)
+
+# Characters an IPv4/IPv6 address or CIDR can consist of
+_IP_TOKEN_RE = re.compile(r'[0-9A-Fa-f:./]+')
+
+# Printed after each successful command of a run_ufw_batch() chain
+_BATCH_MARKER = "__vexo_ufw_ok__"
+
+# Last `ufw status` probe: monotonic time and parsed state
+_UFW_STATE = {'time': None, 'state': None}
+
+# Parsed IP groups file, reused while its (mtime_ns, size) is unchanged
+_IP_GROUPS_CACHE = {'stat': None, 'data': None, 'networks': None, 'user_names': None}
+
+# Last `ufw status verbose` output, shared by status, defaults and logging
+_UFW_SNAPSHOT = {'time': None, 'out': None}
 
 
 def is_ufw_installed():
-    """Check if UFW is installed."""
-    return is_installed("ufw")
+    """
+    Check if UFW is installed.
+    
+    Only the ufw binary is checked: a single stat instead of a dpkg query,
+    cheap enough for every menu redraw. install_ufw() still asks dpkg.
+    """
+    return os.path.exists(UFW_BIN)
+
+
+def invalidate_ufw_cache():
+    """Drop the cached UFW status after installing or changing UFW."""
+    _UFW_STATE['time'] = None
+    _UFW_SNAPSHOT['time'] = None
+
+
+def get_ufw_status_verbose():
+    """
+    Get `ufw status verbose` output, reused for UFW_STATUS_TTL seconds.
+    
+    The status line, default policies and logging level all come from this
+    one output, so a menu redraw or backup spawns ufw once for all of them.
+    
+    Returns:
+        str: Command output, or None if ufw failed
+    """
+    now = time.monotonic()
+    if _UFW_SNAPSHOT['time'] is not None and now - _UFW_SNAPSHOT['time'] < UFW_STATUS_TTL:
+        return _UFW_SNAPSHOT['out']
+    
+    result = run_command("ufw status verbose", check=False, silent=True)
+    _UFW_SNAPSHOT['out'] = result.stdout if result.returncode == 0 else None
+    _UFW_SNAPSHOT['time'] = now
+    return _UFW_SNAPSHOT['out']
+
+
+def _read_ufw_conf_enabled():
+    """
+    Read ENABLED= from ufw.conf without spawning ufw.
+    
+    Returns:
+        bool: Whether UFW is enabled, or None if the file is unreadable
+    """
+    try:
+        with open(UFW_CONF_FILE, 'r') as f:
+            for line in f:
+                if line.startswith("ENABLED="):
+                    return line.split("=", 1)[1].strip().strip("'\"").lower() == "yes"
+    except OSError:
+        pass
+    return None
+
+
+def get_ufw_state():
+    """
+    Probe UFW once and share the result for UFW_STATUS_TTL seconds.
+    
+    The active flag comes from ufw.conf when it is readable; otherwise only
+    the "Status:" header of the shared `ufw status verbose` snapshot is used.
+    
+    Returns:
+        dict: installed (bool), active (True/False, None if unknown)
+              and raw `ufw status` header ("" when ufw.conf was used)
+    """
+    now = time.monotonic()
+    if _UFW_STATE['time'] is not None and now - _UFW_STATE['time'] < UFW_STATUS_TTL:
+        return _UFW_STATE['state']
+    
+    state = {"installed": is_ufw_installed(), "active": False, "raw": ""}
+    
+    if state["installed"]:
+        enabled = _read_ufw_conf_enabled()
+        if enabled is not None:
+            state["active"] = enabled
+        else:
+            output = get_ufw_status_verbose() or ""
+            state["active"] = None
+            state["raw"] = "\n".join(output.splitlines()[:2])
+            status = state["raw"].lower()
+            if "inactive" in status:
+                state["active"] = False
+            elif "active" in status:
+                state["active"] = True
+    
+    _UFW_STATE['time'] = now
+    _UFW_STATE['state'] = state
+    return state
 
 
 def is_ufw_active():
     """Check if UFW is active."""
-    if not is_ufw_installed():
-        return False
-    result = run_command("ufw status", check=False, silent=True)
-    if result.returncode == 0:
-        return "active" in result.stdout.lower() and "inactive" not in result.stdout.lower()
-    return False
+    return get_ufw_state()["active"] is True
 
 
 def get_ufw_status_text():
     """Get UFW status as formatted text."""
-    if not is_ufw_installed():
+    state = get_ufw_state()
+    if not state["installed"]:
         return "[dim]Not installed[/dim]"
-    
-    result = run_command("ufw status", check=False, silent=True)
-    if result.returncode == 0:
-        if "inactive" in result.stdout.lower():
-            return "[yellow]Inactive[/yellow]"
-        elif "active" in result.stdout.lower():
-            return "[green]Active[/green]"
+    if state["active"] is False:
+        return "[yellow]Inactive[/yellow]"
+    if state["active"]:
+        return "[green]Active[/green]"
     return "[dim]Unknown[/dim]"
 
 
+@contextmanager
+def ufw_lock():
+    """
+    Hold an exclusive lock while changing UFW rules.
+    
+    Concurrent ufw invocations (two vexo sessions, or a change during an
+    auto-backup restore) can race on the rules files and fail silently;
+    callers queue on this lock instead.
+    """
+    try:
+        fd = os.open(UFW_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        fd = os.open(UFW_LOCK_FALLBACK, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def run_ufw_batch(commands, continue_on_error=True, locked=False):
+    """
+    Run several ufw commands in one shell invocation.
+    
+    The commands are chained with && so the common all-succeed case costs a
+    single process spawn; a marker echoed after each command tells how far
+    the chain got if one of them fails.
+    
+    Args:
+        commands: List of ufw command strings, run in order
+        continue_on_error: Run the commands after a failed one separately.
+                           Pass False when later commands depend on earlier
+                           ones, e.g. deleting rules by number.
+        locked: The caller already holds ufw_lock(), e.g. to check the rule
+                numbers it is about to delete under the same lock
+    
+    Returns:
+        list: One bool per command, True if it succeeded
+    """
+    if not commands:
+        return []
+    
+    invalidate_ufw_cache()
+    if locked:
+        return _run_batch_script(commands, continue_on_error)
+    with ufw_lock():
+        return _run_batch_script(commands, continue_on_error)
+
+
+def _run_batch_script(commands, continue_on_error):
+    """Chain the commands for run_ufw_batch(); the caller holds ufw_lock()."""
+    script = " && ".join(f"{cmd} && echo {_BATCH_MARKER}" for cmd in commands)
+    result = run_command(script, check=False, silent=True)
+    done = result.stdout.split().count(_BATCH_MARKER) if result.stdout else 0
+    if done >= len(commands):
+        return [True] * len(commands)
+    
+    results = [True] * done + [False]
+    for cmd in commands[done + 1:]:
+        if continue_on_error:
+            results.append(run_command(cmd, check=False, silent=True).returncode == 0)
+        else:
+            results.append(False)
+    return results
+
+
+def run_ufw_command(cmd, discard_output=False):
+    """
+    Run one ufw command that changes rules or settings.
+    
+    Holds ufw_lock() for the command and drops the cached status after it;
+    do not call it while already holding the lock.
+    
+    Args:
+        cmd: ufw command string
+        discard_output: Send output to /dev/null when the caller does not
+                        show it
+    
+    Returns:
+        subprocess.CompletedProcess
+    """
+    with ufw_lock():
+        result = run_command(cmd, check=False, silent=True, discard_output=discard_output)
+    invalidate_ufw_cache()
+    return result
+
+
+def iter_ufw_rules():
+    """Yield UFW rules as dicts with number and rule text, in order."""
+    for line in iter_command_lines("ufw status numbered"):
+        match = _RULE_RE.match(line)
+        if match:
+            yield {"number": int(match.group(1)), "rule": match.group(2)}
+
+
 def get_ufw_rules():
     """Get list of UFW rules as list of dicts."""
-    result = run_command("ufw status numbered", check=False, silent=True)
-    if result.returncode != 0:
-        return []
+    return list(iter_ufw_rules())
+
+
+def read_user_rules():
+    """
+    Read the rules UFW stores in its user rules files, without running ufw.
     
+    Each rule is recorded there as a line like
+    "### tuple ### allow tcp 22 0.0.0.0/0 any 0.0.0.0/0 in".
+    The files are root-only, so callers should fall back to `ufw status`
+    when None is returned.
+    
+    Returns:
+        list: Dicts with action, protocol, dport, dst, sport, src, app
+              (the destination application profile or None) and direction
+              ("in" or "out"), or None if the files cannot be read
+    """
     rules = []
-    for line in result.stdout.strip().split('\n'):
-        if line.strip().startswith('['):
-            match = re.match(r'\[\s*(\d+)\]\s+(.+)', line)
-            if match:
-                rules.append({
-                    "number": int(match.group(1)),
-                    "rule": match.group(2).strip()
-                })
+    try:
+        for path in UFW_USER_RULES_FILES:
+            with open(path, 'r') as f:
+                for line in f:
+                    if not line.startswith("### tuple ###"):
+                        continue
+                    fields = line.split()[3:]
+                    if len(fields) < 6:
+                        continue
+                    has_apps = len(fields) >= 9 and not fields[6].startswith("comment=")
+                    app = fields[6] if has_apps else "-"
+                    if has_apps:
+                        direction = fields[8]
+                    else:
+                        direction = fields[6] if len(fields) > 6 else "in"
+                    rules.append({
+                        "action": fields[0],
+                        "protocol": fields[1],
+                        "dport": fields[2],
+                        "dst": fields[3],
+                        "sport": fields[4],
+                        "src": fields[5],
+                        "app": None if app == "-" else app,
+                        "direction": direction,
+                    })
+    except OSError:
+        return None
     return rules
 
 
+def read_default_policies():
+    """
+    Read the incoming/outgoing default policies from /etc/default/ufw.
+    
+    Returns:
+        dict: incoming and outgoing as "allow", "deny" or "reject",
+              or None if the file cannot be read
+    """
+    keys = {"DEFAULT_INPUT_POLICY": "incoming", "DEFAULT_OUTPUT_POLICY": "outgoing"}
+    names = {"ACCEPT": "allow", "DROP": "deny", "REJECT": "reject"}
+    policies = {}
+    try:
+        with open(UFW_DEFAULTS_FILE, 'r') as f:
+            for line in f:
+                key, sep, value = line.strip().partition("=")
+                if sep and key in keys:
+                    policies[keys[key]] = names.get(value.strip("'\"").upper(), "unknown")
+    except OSError:
+        return None
+    return policies
+
+
 def get_ufw_defaults():
     """Get UFW default policies."""
-    result = run_command("ufw status verbose", check=False, silent=True)
-    if result.returncode != 0:
+    output = get_ufw_status_verbose()
+    if output is None:
         return {"incoming": "unknown", "outgoing": "unknown", "routed": "unknown"}
     
     defaults = {"incoming": "unknown", "outgoing": "unknown", "routed": "unknown"}
     
-    for line in result.stdout.split('\n'):
-        line_lower = line.lower()
-        if "default:" in line_lower:
-            if "deny (incoming)" in line_lower:
-                defaults["incoming"] = "deny"
-            elif "allow (incoming)" in line_lower:
-                defaults["incoming"] = "allow"
-            if "allow (outgoing)" in line_lower:
-                defaults["outgoing"] = "allow"
-            elif "deny (outgoing)" in line_lower:
-                defaults["outgoing"] = "deny"
-            if "disabled (routed)" in line_lower:
-                defaults["routed"] = "disabled"
-            elif "deny (routed)" in line_lower:
-                defaults["routed"] = "deny"
+    for match in _DEFAULT_LINE_RE.finditer(output):
+        for policy, direction in _DEFAULT_POLICY_RE.findall(match.group(1)):
+            defaults[direction.lower()] = policy.lower()
     
     return defaults
 
 
 def get_rule_count():
     """Get total number of UFW rules."""
-    return len(get_ufw_rules())
+    return sum(1 for _ in iter_ufw_rules())
 
 
 def ensure_config_dir():
@@ -99,16 +352,96 @@ def ensure_config_dir():
     os.makedirs(VEXO_FIREWALL_BACKUPS, exist_ok=True)
 
 
-def load_ip_groups():
-    """Load IP groups from config file."""
-    if not os.path.exists(IP_GROUPS_FILE):
-        return {}
-    
+def _copy_ip_groups(groups):
+    """Copy groups deep enough that callers can edit the ips/rules lists."""
+    return {
+        name: {key: list(value) if isinstance(value, list) else value for key, value in group.items()}
+        if isinstance(group, dict) else group
+        for name, group in groups.items()
+    }
+
+
+def _file_signature(path):
+    """Return (mtime_ns, size) of path, or None if it does not exist."""
     try:
-        with open(IP_GROUPS_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _cached_ip_groups():
+    """Return the cached IP groups, re-reading the file if it changed."""
+    signature = _file_signature(IP_GROUPS_FILE)
+    if signature is None:
+        _IP_GROUPS_CACHE.update(stat=None, data={}, networks=None, user_names=None)
         return {}
+    
+    if _IP_GROUPS_CACHE['stat'] != signature:
+        try:
+            with open(IP_GROUPS_FILE, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            _IP_GROUPS_CACHE.update(stat=None, data={}, networks=None, user_names=None)
+            return {}
+        _IP_GROUPS_CACHE['stat'] = signature
+        _IP_GROUPS_CACHE['data'] = data if isinstance(data, dict) else {}
+        _IP_GROUPS_CACHE['networks'] = None
+        _IP_GROUPS_CACHE['user_names'] = None
+    
+    return _IP_GROUPS_CACHE['data']
+
+
+def load_ip_groups():
+    """
+    Load IP groups from config file.
+    
+    The file is parsed once per change; menus call this on every redraw.
+    Callers get their own copy and may modify it freely.
+    """
+    return _copy_ip_groups(_cached_ip_groups())
+
+
+def load_user_group_names():
+    """
+    Get the names of user-defined IP groups, in file order.
+    
+    Groups starting with "_" (such as "_whitelist") are vexo's own. The
+    split is made once per change of the groups file.
+    
+    Returns:
+        tuple: Group names
+    """
+    groups = _cached_ip_groups()
+    if _IP_GROUPS_CACHE['user_names'] is None:
+        _IP_GROUPS_CACHE['user_names'] = tuple(name for name in groups if not name.startswith('_'))
+    return _IP_GROUPS_CACHE['user_names']
+
+
+def load_ip_networks():
+    """
+    Get every group's IPs parsed as ipaddress networks.
+    
+    Parsed once per change of the groups file and kept apart from the
+    groups themselves, which stay JSON-ready strings.
+    
+    Returns:
+        dict: Group name -> list of (ip string, IPv4Network/IPv6Network);
+              entries that do not parse are left out
+    """
+    groups = _cached_ip_groups()
+    if _IP_GROUPS_CACHE['networks'] is None:
+        networks = {}
+        for name, group in groups.items():
+            parsed = []
+            for ip in group.get("ips", []) if isinstance(group, dict) else []:
+                try:
+                    parsed.append((ip, ip_network(ip, strict=False)))
+                except ValueError:
+                    continue
+            networks[name] = parsed
+        _IP_GROUPS_CACHE['networks'] = networks
+    return _IP_GROUPS_CACHE['networks']
 
 
 def save_ip_groups(groups):
@@ -116,6 +449,10 @@ def save_ip_groups(groups):
     ensure_config_dir()
     with open(IP_GROUPS_FILE, 'w') as f:
         json.dump(groups, f, indent=2)
+    _IP_GROUPS_CACHE['stat'] = _file_signature(IP_GROUPS_FILE)
+    _IP_GROUPS_CACHE['data'] = _copy_ip_groups(groups)
+    _IP_GROUPS_CACHE['networks'] = None
+    _IP_GROUPS_CACHE['user_names'] = None
 
 
 def get_ip_group(name):
@@ -156,6 +493,84 @@ def add_ip_to_group(group_name, ip):
     return False
 
 
+def parse_ip_list(text):
+    """
+    Split pasted text into IPs/CIDRs and validate them.
+    
+    Entries may be separated by whitespace or commas. Tokens containing
+    characters no address can have are rejected without being parsed.
+    
+    Returns:
+        tuple: (valid entries, invalid entries), each in input order
+    """
+    valid = []
+    invalid = []
+    for token in text.replace(',', ' ').split():
+        if _IP_TOKEN_RE.fullmatch(token):
+            try:
+                ip_network(token, strict=False)
+                valid.append(token)
+                continue
+            except ValueError:
+                pass
+        invalid.append(token)
+    return valid, invalid
+
+
+def covering_entry(ip_str, entries):
+    """
+    Find the entry that equals or contains an IP/CIDR.
+    
+    Args:
+        ip_str: IP or CIDR to look up
+        entries: (ip string, network) pairs, as in load_ip_networks()
+    
+    Returns:
+        str: The existing entry (ip_str itself for an exact match), or None
+    """
+    network = ip_network(ip_str, strict=False)
+    for entry, existing in entries:
+        if existing.version == network.version and network.subnet_of(existing):
+            return entry
+    return None
+
+
+def group_covering_entry(group_name, ip_str):
+    """Find the entry of a group that equals or contains an IP/CIDR, or None."""
+    return covering_entry(ip_str, load_ip_networks().get(group_name, []))
+
+
+def bulk_add_ips(group_name, text):
+    """
+    Add every valid IP in pasted text to a group, saving once.
+    
+    Entries already in the group, or contained in one of its entries, are
+    skipped the same way a single added IP is.
+    
+    Returns:
+        tuple: (added entries, (entry, covering entry) pairs skipped because
+               an existing entry contains them, invalid entries); exact
+               duplicates are in none of them
+    """
+    valid, invalid = parse_ip_list(text)
+    groups = load_ip_groups()
+    group = groups.setdefault(group_name, {"ips": [], "rules": []})
+    entries = list(load_ip_networks().get(group_name, []))
+    added = []
+    covered = []
+    for ip in valid:
+        covering = covering_entry(ip, entries)
+        if covering is None:
+            entries.append((ip, ip_network(ip, strict=False)))
+            group["ips"].append(ip)
+            added.append(ip)
+        elif covering != ip:
+            covered.append((ip, covering))
+    if added:
+        save_ip_groups(groups)
+    return added, covered, invalid
+
+
 def remove_ip_from_group(group_name, ip):
     """Remove an IP from a group."""
     groups = load_ip_groups()
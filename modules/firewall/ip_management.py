@@ -1,6 +1,7 @@
 """IP management for firewall."""
 
 import re
+from ipaddress import ip_network
 from ui.components import (
     console,
     clear_screen,
@@ -13,22 +14,36 @@ from ui.components import (
     press_enter_to_continue,
 )
 from ui.menu import run_menu_loop, text_input, select_from_list, confirm_action
-from utils.shell import run_command, require_root
+from utils.shell import require_root
 from utils.error_handler import handle_error
 from modules.firewall.common import (
     is_ufw_installed,
     get_ufw_status_text,
-    get_ufw_rules,
+    iter_ufw_rules,
+    run_ufw_batch,
+    run_ufw_command,
+    read_user_rules,
     load_ip_groups,
+    load_ip_networks,
+    load_user_group_names,
     save_ip_groups,
     create_ip_group,
     delete_ip_group,
     add_ip_to_group,
+    bulk_add_ips,
+    covering_entry,
+    group_covering_entry,
+    parse_ip_list,
     remove_ip_from_group,
     ensure_config_dir,
 )
 
 
+# An IPv4 or IPv6 address in a `ufw status` rule line; port ranges such as
+# "6000:6007" have a single colon and do not match
+_IP_RULE_RE = re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}\b|(?<![\w:])[0-9a-fA-F]{0,4}(?::[0-9a-fA-F]{0,4}){2,}')
+
+
 def show_ip_menu():
     """Display IP management submenu."""
     def get_status():
@@ -70,7 +85,7 @@ def allow_ip():
     mode = select_from_list(
         title="Mode",
         message="Select mode:",
-        options=["Simple (IP only)", "Advanced (IP + port/protocol)"]
+        options=[("simple", "Simple (IP only)"), ("advanced", "Advanced (IP + port/protocol)")]
     )
     
     if not mode:
@@ -93,7 +108,7 @@ def allow_ip():
         press_enter_to_continue()
         return
     
-    if "Simple" in mode:
+    if mode == "simple":
         # Simple mode - allow all from IP
         _apply_ip_rule(ip, "allow")
     else:
@@ -118,7 +133,7 @@ def deny_ip():
     mode = select_from_list(
         title="Mode",
         message="Select mode:",
-        options=["Simple (block all)", "Advanced (block specific ports)"]
+        options=[("simple", "Simple (block all)"), ("advanced", "Advanced (block specific ports)")]
     )
     
     if not mode:
@@ -145,19 +160,17 @@ def deny_ip():
     action = select_from_list(
         title="Action",
         message="Select action type:",
-        options=["deny (silent drop)", "reject (send rejection)"]
+        options=[("deny", "deny (silent drop)"), ("reject", "reject (send rejection)")]
     )
     
     if not action:
         press_enter_to_continue()
         return
     
-    action_cmd = "deny" if "deny" in action else "reject"
-    
-    if "Simple" in mode:
-        _apply_ip_rule(ip, action_cmd)
+    if mode == "simple":
+        _apply_ip_rule(ip, action)
     else:
-        _apply_advanced_ip_rule(ip, action_cmd)
+        _apply_advanced_ip_rule(ip, action)
     
     press_enter_to_continue()
 
@@ -174,7 +187,7 @@ def _apply_ip_rule(ip, action):
         return
     
     cmd = f"ufw {action} from {ip}"
-    result = run_command(cmd, check=False, silent=True)
+    result = run_ufw_command(cmd)
     
     if result.returncode == 0:
         show_success(f"Rule added: {action} from {ip}")
@@ -188,15 +201,13 @@ def _apply_advanced_ip_rule(ip, action):
     direction = select_from_list(
         title="Direction",
         message="Select direction:",
-        options=["in (incoming)", "out (outgoing)"]
+        options=[("in", "in (incoming)"), ("out", "out (outgoing)")]
     )
     
     if not direction:
         show_warning("Cancelled.")
         return
     
-    direction_cmd = "in" if "in" in direction else "out"
-    
     # Port (optional)
     port = text_input(
         title="Port",
@@ -220,6 +231,11 @@ def _apply_advanced_ip_rule(ip, action):
             show_warning("Cancelled.")
             return
     
+    try:
+        require_root()
+    except PermissionError:
+        return
+    
     # Build command
     if port:
         if protocol == "both":
@@ -227,12 +243,14 @@ def _apply_advanced_ip_rule(ip, action):
         else:
             protocols = [protocol]
         
-        for proto in protocols:
-            cmd = f"ufw {action} {direction_cmd} from {ip} to any port {port} proto {proto}"
-            _execute_rule(cmd, f"{action} {ip} to port {port}/{proto}")
+        _execute_rules([
+            (f"ufw {action} {direction} from {ip} to any port {port} proto {proto}",
+             f"{action} {ip} to port {port}/{proto}")
+            for proto in protocols
+        ])
     else:
-        cmd = f"ufw {action} {direction_cmd} from {ip}"
-        _execute_rule(cmd, f"{action} {ip}")
+        cmd = f"ufw {action} {direction} from {ip}"
+        _run_rule(cmd, f"{action} {ip}")
 
 
 def _execute_rule(cmd, description):
@@ -242,7 +260,12 @@ def _execute_rule(cmd, description):
     except PermissionError:
         return False
     
-    result = run_command(cmd, check=False, silent=True)
+    return _run_rule(cmd, description)
+
+
+def _run_rule(cmd, description):
+    """Execute a UFW rule command; the caller has already checked root."""
+    result = run_ufw_command(cmd)
     
     if result.returncode == 0:
         console.print(f"  [green]✓[/green] {description}")
@@ -252,6 +275,103 @@ def _execute_rule(cmd, description):
         return False
 
 
+def _execute_rules(rules):
+    """
+    Execute several UFW rule commands in one batch.
+    
+    Callers check require_root() once before building the batch.
+    
+    Args:
+        rules: List of (command, description) tuples
+    
+    Returns:
+        int: Number of rules applied successfully
+    """
+    results = run_ufw_batch([cmd for cmd, _ in rules])
+    
+    for (_, description), ok in zip(rules, results):
+        if ok:
+            console.print(f"  [green]✓[/green] {description}")
+        else:
+            console.print(f"  [red]✗[/red] {description}")
+    
+    return sum(results)
+
+
+def _format_network(network):
+    """Format a network the way UFW records it (hosts without /32)."""
+    if network.prefixlen == network.max_prefixlen:
+        return str(network.network_address)
+    return str(network)
+
+
+def _normalize_ip(ip_str):
+    """Normalize an IP or CIDR the way UFW records it."""
+    return _format_network(ip_network(ip_str, strict=False))
+
+
+def _group_rule_targets(group_name):
+    """
+    List the sources a group's rules are applied for, one per entry.
+    
+    Entries are not merged into wider CIDRs: removing an entry deletes the
+    rule for that entry, which only works if the rule was installed as is.
+    Entries that UFW would record identically (1.2.3.4 and 1.2.3.4/32)
+    are applied once.
+    
+    Returns:
+        list: Sources in UFW notation, in group order
+    """
+    targets = []
+    seen = set()
+    for _, network in load_ip_networks().get(group_name, []):
+        source = _format_network(network)
+        if source not in seen:
+            seen.add(source)
+            targets.append(source)
+    return targets
+
+
+def _missing_source_rules(action, ips):
+    """
+    Filter out IPs that already have a plain `ufw <action> from <ip>` rule.
+    
+    Existing rules come from UFW's user rules files, so no ufw process is
+    started; when they cannot be read every IP is returned.
+    
+    Args:
+        action: "allow" or "deny"
+        ips: IPs or CIDRs to apply
+    
+    Returns:
+        list: IPs from ips that still need a rule, in order
+    """
+    rules = read_user_rules()
+    if rules is None:
+        return list(ips)
+    
+    existing = set()
+    for rule in rules:
+        if (rule["action"] != action or rule["direction"] != "in" or rule["app"]
+                or rule["protocol"] != "any" or rule["dport"] != "any" or rule["sport"] != "any"
+                or rule["dst"] not in ("0.0.0.0/0", "::/0")):
+            continue
+        try:
+            existing.add(_normalize_ip(rule["src"]))
+        except ValueError:
+            continue
+    
+    missing = []
+    for ip in ips:
+        try:
+            if _normalize_ip(ip) in existing:
+                continue
+        except ValueError:
+            pass
+        missing.append(ip)
+    return missing
+
+
 def manage_whitelist():
     """Manage IP whitelist (always allowed IPs)."""
     def get_status():
@@ -303,8 +423,11 @@ def _add_to_whitelist():
     if "_whitelist" not in groups:
         groups["_whitelist"] = {"ips": [], "rules": ["allow all"]}
     
-    if ip in groups["_whitelist"]["ips"]:
+    covering = group_covering_entry("_whitelist", ip)
+    if covering == ip:
         show_info(f"{ip} is already in whitelist.")
+    elif covering:
+        show_info(f"{ip} is already covered by whitelist entry {covering}.")
     else:
         groups["_whitelist"]["ips"].append(ip)
         save_ip_groups(groups)
@@ -362,9 +485,9 @@ def _view_whitelist():
     if not whitelist:
         show_info("Whitelist is empty.")
     else:
-        console.print("[bold]Whitelisted IPs:[/bold]")
-        for ip in whitelist:
-            console.print(f"  • {ip}")
+        lines = ["[bold]Whitelisted IPs:[/bold]"]
+        lines.extend(f"  • {ip}" for ip in whitelist)
+        console.print("\n".join(lines))
     
     press_enter_to_continue()
 
@@ -394,20 +517,29 @@ def _apply_whitelist():
         press_enter_to_continue()
         return
     
-    for ip in whitelist:
-        _execute_rule(f"ufw allow from {ip}", f"Allow {ip}")
+    targets = _group_rule_targets("_whitelist")
+    pending = _missing_source_rules("allow", targets)
+    if not pending:
+        show_info("All whitelist rules are already applied.")
+        press_enter_to_continue()
+        return
+    if len(pending) < len(targets):
+        console.print(f"[dim]Skipping {len(targets) - len(pending)} rules already in place.[/dim]")
+    
+    applied = _execute_rules([(f"ufw allow from {ip}", f"Allow {ip}") for ip in pending])
     
     console.print()
-    show_success("Whitelist rules applied!")
+    if applied == len(pending):
+        show_success("Whitelist rules applied!")
+    else:
+        show_warning(f"Applied {applied}/{len(pending)} whitelist rules.")
     press_enter_to_continue()
 
 
 def manage_ip_groups():
     """Manage IP groups."""
     def get_status():
-        groups = load_ip_groups()
-        user_groups = {k: v for k, v in groups.items() if not k.startswith('_')}
-        return f"Groups: {len(user_groups)}"
+        return f"Groups: {len(load_user_group_names())}"
     
     options = [
         ("create", "1. Create Group"),
@@ -457,30 +589,39 @@ def _create_group():
         return
     
     # Add initial IPs
-    console.print("Enter IP addresses (one per line, empty line to finish):")
+    console.print("Enter IP addresses (several per line separated by spaces or commas, empty line to finish):")
     ips = []
+    entries = []
     while True:
-        ip = text_input(title="IP", message=f"IP {len(ips)+1}:", default="")
-        if not ip:
+        line = text_input(title="IP", message=f"IP {len(ips)+1}:", default="")
+        if not line:
             break
-        if _validate_ip_or_cidr(ip):
-            ips.append(ip)
-            console.print(f"  [green]✓[/green] Added {ip}")
-        else:
+        valid, invalid = parse_ip_list(line)
+        for ip in valid:
+            covering = covering_entry(ip, entries)
+            if covering == ip:
+                console.print(f"  [dim]Already added: {ip}[/dim]")
+            elif covering:
+                console.print(f"  [dim]Already covered by {covering}: {ip}[/dim]")
+            else:
+                ips.append(ip)
+                entries.append((ip, ip_network(ip, strict=False)))
+                console.print(f"  [green]✓[/green] Added {ip}")
+        for ip in invalid:
             console.print(f"  [red]✗[/red] Invalid: {ip}")
     
     # Default rule
     rule = select_from_list(
         title="Default Rule",
         message="Default action for this group:",
-        options=["allow (all ports)", "deny (all ports)", "custom (configure later)"]
+        options=[
+            ("allow all", "allow (all ports)"),
+            ("deny all", "deny (all ports)"),
+            ("custom", "custom (configure later)"),
+        ]
     )
     
-    rules = []
-    if rule and "allow" in rule:
-        rules = ["allow all"]
-    elif rule and "deny" in rule:
-        rules = ["deny all"]
+    rules = [rule] if rule in ("allow all", "deny all") else []
     
     create_ip_group(name, ips, rules)
     show_success(f"Group '{name}' created with {len(ips)} IPs.")
@@ -495,7 +636,7 @@ def _edit_group():
     show_panel("Edit IP Group", title="IP Groups", style="cyan")
     
     groups = load_ip_groups()
-    user_groups = [k for k in groups.keys() if not k.startswith('_')]
+    user_groups = list(load_user_group_names())
     
     if not user_groups:
         show_info("No groups to edit.")
@@ -521,10 +662,22 @@ def _edit_group():
     )
     
     if action == "Add IP":
-        ip = text_input(title="IP", message="Enter IP to add:")
-        if ip and _validate_ip_or_cidr(ip):
-            add_ip_to_group(name, ip)
-            show_success(f"Added {ip} to group '{name}'.")
+        ip = text_input(title="IP", message="Enter IP to add (or several, separated by spaces or commas):")
+        if ip and len(ip.replace(',', ' ').split()) > 1:
+            added, covered, invalid = bulk_add_ips(name, ip)
+            show_success(f"Added {len(added)} IPs to group '{name}'.")
+            for entry, covering in covered:
+                show_info(f"{entry} is already covered by {covering} in group '{name}'.")
+            if invalid:
+                show_warning(f"Skipped {len(invalid)} invalid entries: {', '.join(invalid[:10])}")
+        elif ip and _validate_ip_or_cidr(ip):
+            covering = group_covering_entry(name, ip)
+            if covering and covering != ip:
+                show_info(f"{ip} is already covered by {covering} in group '{name}'.")
+            elif add_ip_to_group(name, ip):
+                show_success(f"Added {ip} to group '{name}'.")
+            else:
+                show_info(f"{ip} is already in group '{name}'.")
         else:
             handle_error("E6001", "Invalid IP.")
     
@@ -562,7 +715,7 @@ def _delete_group():
     show_panel("Delete IP Group", title="IP Groups", style="cyan")
     
     groups = load_ip_groups()
-    user_groups = [k for k in groups.keys() if not k.startswith('_')]
+    user_groups = list(load_user_group_names())
     
     if not user_groups:
         show_info("No groups to delete.")
@@ -599,21 +752,24 @@ def _list_groups():
     show_panel("IP Groups", title="IP Groups", style="cyan")
     
     groups = load_ip_groups()
-    user_groups = {k: v for k, v in groups.items() if not k.startswith('_')}
+    user_groups = load_user_group_names()
     
     if not user_groups:
         show_info("No IP groups configured.")
         press_enter_to_continue()
         return
     
-    for name, data in user_groups.items():
+    # Render the whole listing with a single print
+    lines = []
+    for name in user_groups:
+        data = groups[name]
         rule_str = data["rules"][0] if data["rules"] else "no rule"
-        console.print(f"[bold cyan]{name}[/bold cyan] ({len(data['ips'])} IPs) → {rule_str}")
-        for ip in data["ips"][:5]:
-            console.print(f"    {ip}")
+        lines.append(f"[bold cyan]{name}[/bold cyan] ({len(data['ips'])} IPs) → {rule_str}")
+        lines.extend(f"    {ip}" for ip in data["ips"][:5])
         if len(data["ips"]) > 5:
-            console.print(f"    [dim]... and {len(data['ips']) - 5} more[/dim]")
-        console.print()
+            lines.append(f"    [dim]... and {len(data['ips']) - 5} more[/dim]")
+        lines.append("")
+    console.print("\n".join(lines))
     
     press_enter_to_continue()
 
@@ -625,7 +781,7 @@ def _apply_group_rules():
     show_panel("Apply Group Rules", title="IP Groups", style="cyan")
     
     groups = load_ip_groups()
-    user_groups = [k for k in groups.keys() if not k.startswith('_')]
+    user_groups = list(load_user_group_names())
     
     if not user_groups:
         show_info("No groups to apply.")
@@ -655,7 +811,7 @@ def _apply_group_rules():
         return
     
     rule_type = group["rules"][0]
-    action = "allow" if "allow" in rule_type else "deny"
+    action = "allow" if rule_type.startswith("allow") else "deny"
     
     if not confirm_action(f"Apply '{action}' rule for {len(group['ips'])} IPs?"):
         show_warning("Cancelled.")
@@ -668,11 +824,24 @@ def _apply_group_rules():
         press_enter_to_continue()
         return
     
-    for ip in group["ips"]:
-        _execute_rule(f"ufw {action} from {ip}", f"{action.capitalize()} {ip}")
+    targets = _group_rule_targets(name)
+    pending = _missing_source_rules(action, targets)
+    if not pending:
+        show_info(f"All rules for group '{name}' are already applied.")
+        press_enter_to_continue()
+        return
+    if len(pending) < len(targets):
+        console.print(f"[dim]Skipping {len(targets) - len(pending)} rules already in place.[/dim]")
+    
+    applied = _execute_rules([
+        (f"ufw {action} from {ip}", f"{action.capitalize()} {ip}") for ip in pending
+    ])
     
     console.print()
-    show_success(f"Applied rules for group '{name}'!")
+    if applied == len(pending):
+        show_success(f"Applied rules for group '{name}'!")
+    else:
+        show_warning(f"Applied {applied}/{len(pending)} rules for group '{name}'.")
     
     press_enter_to_continue()
 
@@ -688,45 +857,32 @@ def list_ip_rules():
         press_enter_to_continue()
         return
     
-    rules = get_ufw_rules()
-    
-    # Filter IP-related rules (those with "from" in them)
-    ip_rules = [r for r in rules if "from" in r["rule"].lower() or "to" in r["rule"].lower()]
+    # Print IP-related rules (those naming an address instead of Anywhere)
+    # as ufw lists them, without collecting the full rule list first
+    matched = False
+    for rule in iter_ufw_rules():
+        if not _IP_RULE_RE.search(rule["rule"]):
+            continue
+        if not matched:
+            console.print("[bold]IP-Specific Rules:[/bold]")
+            console.print()
+            matched = True
+        console.print(f"  [{rule['number']}] {rule['rule']}")
     
-    if not ip_rules:
+    if not matched:
         show_info("No IP-specific rules found.")
         console.print("[dim]Only port-based rules are configured.[/dim]")
-        press_enter_to_continue()
-        return
-    
-    console.print("[bold]IP-Specific Rules:[/bold]")
-    console.print()
-    
-    for rule in ip_rules:
-        console.print(f"  [{rule['number']}] {rule['rule']}")
     
     press_enter_to_continue()
 
 
 def _validate_ip_or_cidr(ip_str):
-    """Validate IP address or CIDR notation."""
-    # IPv4 pattern
-    ipv4_pattern = r'^(\d{1,3}\.){3}\d{1,3}(/\d{1,2})?$'
-    
-    if re.match(ipv4_pattern, ip_str):
-        # Validate octets
-        parts = ip_str.split('/')[0].split('.')
-        for part in parts:
-            if int(part) > 255:
-                return False
-        # Validate CIDR if present
-        if '/' in ip_str:
-            cidr = int(ip_str.split('/')[1])
-            if cidr > 32:
-                return False
+    """Validate IPv4/IPv6 address or CIDR notation."""
+    try:
+        ip_network(ip_str, strict=False)
         return True
-    
-    return False
+    except ValueError:
+        return False
 
 
 def _validate_port(port_str):
@@ -15,9 +15,14 @@ from ui.components import (
     press_enter_to_continue,
 )
 from ui.menu import run_menu_loop, text_input, select_from_list, confirm_action
-from utils.shell import run_command, require_root
+from utils.shell import require_root
 from utils.error_handler import handle_error
-from modules.firewall.common import is_ufw_installed, get_ufw_status_text
+from modules.firewall.common import (
+    is_ufw_installed,
+    get_ufw_status_text,
+    get_ufw_status_verbose,
+    run_ufw_command,
+)
 
 
 # Log file paths
@@ -51,11 +56,11 @@ def show_logs_menu():
 
 def _get_log_level():
     """Get current UFW logging level."""
-    result = run_command("ufw status verbose", check=False, silent=True)
-    if result.returncode != 0:
+    output = get_ufw_status_verbose()
+    if output is None:
         return "unknown"
     
-    for line in result.stdout.split('\n'):
+    for line in output.split('\n'):
         if "Logging:" in line:
             parts = line.split(':')
             if len(parts) >= 2:
@@ -412,7 +417,7 @@ def configure_logging():
         press_enter_to_continue()
         return
     
-    result = run_command(f"ufw logging {new_level}", check=False, silent=True)
+    result = run_ufw_command(f"ufw logging {new_level}")
     
     if result.returncode == 0:
         show_success(f"Log level changed to '{new_level}'!")
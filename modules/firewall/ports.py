@@ -20,9 +20,24 @@ from modules.firewall.common import (
     is_ufw_installed,
     get_ufw_status_text,
     get_ufw_rules,
+    get_ufw_state,
+    run_ufw_batch,
+    read_user_rules,
+    ufw_lock,
+    invalidate_ufw_cache,
 )
 
 
+# Rules listed per page when choosing rules to remove
+RULES_PAGE_SIZE = 25
+
+# Comma-separated rule numbers, e.g. "3" or "3, 5,7"
+_RULE_NUMBERS_RE = re.compile(r'^\s*[0-9]+(?:\s*,\s*[0-9]+)*\s*$')
+
+# Port (1-65535) or start:end range, bounds checked in _parse_port()
+_PORT_RE = re.compile(r'^([1-9][0-9]{0,4})(?::([1-9][0-9]{0,4}))?$')
+
+
 def show_ports_menu():
     """Display port management submenu."""
     def get_status():
@@ -60,7 +75,7 @@ def add_custom_port():
     # Get port number
     port = text_input(
         title="Port",
-        message="Enter port number (e.g., 8080) or range (e.g., 6000:6010):"
+        message="Enter port, range or list (e.g., 8080, 6000:6010, 8080,8443):"
     )
     
     if not port:
@@ -69,8 +84,8 @@ def add_custom_port():
         return
     
     # Validate port
-    if not _validate_port(port):
-        handle_error("E6001", "Invalid port. Use single port (1-65535) or range (e.g., 6000:6010).")
+    if not all(_validate_port(p.strip()) for p in port.split(',')):
+        handle_error("E6001", "Invalid port. Use single ports (1-65535) or ranges (e.g., 6000:6010), comma separated.")
         press_enter_to_continue()
         return
     
@@ -129,23 +144,65 @@ def add_custom_port():
     press_enter_to_continue()
 
 
+def _parse_port(port_str):
+    """
+    Parse a port or start:end range.
+    
+    Returns:
+        tuple: (start, end) with start == end for a single port,
+               or None if the string is not a valid port/range
+    """
+    match = _PORT_RE.match(port_str)
+    if not match:
+        return None
+    start = int(match.group(1))
+    end = int(match.group(2) or start)
+    if end > 65535 or start > 65535 or (match.group(2) and start >= end):
+        return None
+    return start, end
+
+
 def _validate_port(port_str):
     """Validate port number or range."""
-    if ':' in port_str:
-        parts = port_str.split(':')
-        if len(parts) != 2:
-            return False
-        try:
-            start, end = int(parts[0]), int(parts[1])
-            return 1 <= start <= 65535 and 1 <= end <= 65535 and start < end
-        except ValueError:
-            return False
-    else:
-        try:
-            port = int(port_str)
-            return 1 <= port <= 65535
-        except ValueError:
-            return False
+    return _parse_port(port_str) is not None
+
+
+def _collapse_ports(port_str):
+    """
+    Merge a comma-separated list of ports/ranges into ufw port specs.
+    
+    Contiguous and overlapping ports are merged into start:end ranges, and
+    the result is packed into comma lists of at most 15 ports (a range
+    counts as two), the limit of a single ufw multiport rule.
+    
+    Args:
+        port_str: Validated port string, e.g. "8000,8001,8002,9000:9010"
+    
+    Returns:
+        list: Port specs, e.g. ["8000:8002,9000:9010"]
+    """
+    spans = sorted(_parse_port(part.strip()) for part in port_str.split(','))
+    
+    merged = [list(spans[0])]
+    for start, end in spans[1:]:
+        if start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    
+    specs = []
+    chunk = []
+    slots = 0
+    for start, end in merged:
+        item = str(start) if start == end else f"{start}:{end}"
+        size = 1 if start == end else 2
+        if slots + size > 15:
+            specs.append(",".join(chunk))
+            chunk, slots = [], 0
+        chunk.append(item)
+        slots += size
+    specs.append(",".join(chunk))
+    return specs
 
 
 def _validate_ip(ip_str):
@@ -157,22 +214,24 @@ def _validate_ip(ip_str):
 def _add_port_rule(port, protocol, from_ip=None):
     """Add a port rule to UFW."""
     protocols = ["tcp", "udp"] if protocol == "both" else [protocol]
-    success = True
+    rules = [(spec, proto) for spec in _collapse_ports(port) for proto in protocols]
     
-    for proto in protocols:
+    commands = []
+    for spec, proto in rules:
         if from_ip:
-            cmd = f"ufw allow from {from_ip} to any port {port} proto {proto}"
+            commands.append(f"ufw allow from {from_ip} to any port {spec} proto {proto}")
         else:
-            cmd = f"ufw allow {port}/{proto}"
-        
-        result = run_command(cmd, check=False, silent=True)
-        if result.returncode != 0:
-            success = False
-            console.print(f"  [red]✗[/red] Failed: {port}/{proto}")
+            commands.append(f"ufw allow {spec}/{proto}")
+    
+    results = run_ufw_batch(commands)
+    
+    for (spec, proto), ok in zip(rules, results):
+        if ok:
+            console.print(f"  [green]✓[/green] Added: {spec}/{proto}")
         else:
-            console.print(f"  [green]✓[/green] Added: {port}/{proto}")
+            console.print(f"  [red]✗[/red] Failed: {spec}/{proto}")
     
-    return success
+    return all(results)
 
 
 def list_ports():
@@ -258,35 +317,65 @@ def remove_port():
         press_enter_to_continue()
         return
     
-    # Display rules
-    console.print("[bold]Current rules:[/bold]")
-    for rule in rules:
-        console.print(f"  {rule['number']}. {rule['rule']}")
-    console.print()
-    
-    # Get rule number
-    rule_num = text_input(
-        title="Remove",
-        message="Enter rule number to remove:"
-    )
+    # Display rules a page at a time; large rule sets are slow to render
+    page = 0
+    while True:
+        start = page * RULES_PAGE_SIZE
+        shown = rules[start:start + RULES_PAGE_SIZE]
+        has_more = start + len(shown) < len(rules)
+        
+        lines = ["[bold]Current rules:[/bold]"]
+        lines.extend(f"  {rule['number']}. {rule['rule']}" for rule in shown)
+        if has_more:
+            lines.append(
+                f"[dim]Showing {start + 1}-{start + len(shown)} of {len(rules)}. "
+                f"Enter 'n' for the next page.[/dim]"
+            )
+        console.print("\n".join(lines) + "\n")
+        
+        # Get rule numbers
+        rule_num = text_input(
+            title="Remove",
+            message="Enter rule number(s) to remove (e.g., 3 or 3,5,7):"
+        )
+        
+        if has_more and rule_num and rule_num.strip().lower() == "n":
+            page += 1
+            clear_screen()
+            show_header()
+            show_panel("Remove Port", title="Port Management", style="cyan")
+            continue
+        break
     
     if not rule_num:
         show_warning("Cancelled.")
         press_enter_to_continue()
         return
     
-    try:
-        num = int(rule_num)
-        if num < 1 or num > len(rules):
-            raise ValueError()
-    except ValueError:
+    if not _RULE_NUMBERS_RE.match(rule_num):
+        handle_error("E6001", "Invalid rule number.")
+        press_enter_to_continue()
+        return
+    
+    # Delete from the highest number down so the remaining numbers stay valid
+    numbers = sorted({int(n) for n in rule_num.split(',')}, reverse=True)
+    if numbers[0] > len(rules) or numbers[-1] < 1:
         handle_error("E6001", "Invalid rule number.")
         press_enter_to_continue()
         return
     
-    selected_rule = rules[num - 1]["rule"]
+    selected_rules = [rules[num - 1]["rule"] for num in numbers]
+    
+    if len(numbers) == 1:
+        prompt = f"Remove rule: {selected_rules[0]}?"
+    else:
+        console.print("[bold]Rules to remove:[/bold]")
+        for num, rule in zip(numbers, selected_rules):
+            console.print(f"  {num}. {rule}")
+        console.print()
+        prompt = f"Remove {len(numbers)} rules?"
     
-    if not confirm_action(f"Remove rule: {selected_rule}?"):
+    if not confirm_action(prompt):
         show_warning("Cancelled.")
         press_enter_to_continue()
         return
@@ -297,10 +386,32 @@ def remove_port():
         press_enter_to_continue()
         return
     
-    result = run_command(f"ufw --force delete {num}", check=False, silent=True)
+    with ufw_lock():
+        # Another session may have renumbered the rules since they were listed
+        current = get_ufw_rules()
+        if all(
+            num <= len(current) and current[num - 1]["rule"] == rule
+            for num, rule in zip(numbers, selected_rules)
+        ):
+            results = run_ufw_batch(
+                [f"ufw --force delete {num}" for num in numbers],
+                continue_on_error=False,
+                locked=True,
+            )
+        else:
+            results = None
+    invalidate_ufw_cache()
     
-    if result.returncode == 0:
-        show_success("Rule removed successfully!")
+    if results is None:
+        handle_error("E6001", "Rule numbers changed since they were listed. Please try again.")
+        press_enter_to_continue()
+        return
+    
+    removed = sum(results)
+    if removed == len(numbers):
+        show_success("Rule removed successfully!" if removed == 1 else f"{removed} rules removed successfully!")
+    elif removed:
+        show_warning(f"Removed {removed}/{len(numbers)} rules.")
     else:
         handle_error("E6001", "Failed to remove rule.")
     
@@ -410,11 +521,13 @@ def apply_preset_category(category):
         return
     
     # Add ports
+    results = run_ufw_batch([
+        f"ufw allow {preset['port']}/{preset['protocol']}" for preset in to_add
+    ])
+    
     success_count = 0
-    for preset in to_add:
-        cmd = f"ufw allow {preset['port']}/{preset['protocol']}"
-        result = run_command(cmd, check=False, silent=True)
-        if result.returncode == 0:
+    for preset, ok in zip(to_add, results):
+        if ok:
             console.print(f"  [green]✓[/green] {preset['name']} ({preset['port']}/{preset['protocol']})")
             success_count += 1
         else:
@@ -495,11 +608,13 @@ def apply_all_presets():
         press_enter_to_continue()
         return
     
+    results = run_ufw_batch([
+        f"ufw allow {preset['port']}/{preset['protocol']}" for preset in to_add
+    ])
+    
     success_count = 0
-    for preset in to_add:
-        cmd = f"ufw allow {preset['port']}/{preset['protocol']}"
-        result = run_command(cmd, check=False, silent=True)
-        if result.returncode == 0:
+    for preset, ok in zip(to_add, results):
+        if ok:
             console.print(f"  [green]✓[/green] {preset['name']}")
             success_count += 1
         else:
@@ -513,6 +628,24 @@ def apply_all_presets():
 
 def _get_open_ports():
     """Get set of currently open ports (port/protocol format)."""
+    # user.rules keeps its rules while UFW is disabled, but none are open
+    active = get_ufw_state()["active"]
+    if active is False:
+        return set()
+    
+    # With the state unknown, `ufw status` below tells an inactive firewall
+    rules = read_user_rules() if active else None
+    if rules is not None:
+        open_ports = set()
+        for rule in rules:
+            if rule["app"] or rule["dport"] == "any":
+                continue
+            protocols = ("tcp", "udp") if rule["protocol"] == "any" else (rule["protocol"],)
+            for port in rule["dport"].split(','):
+                for proto in protocols:
+                    open_ports.add(f"{port}/{proto}")
+        return open_ports
+    
     result = run_command("ufw status", check=False, silent=True)
     if result.returncode != 0:
         return set()
@@ -56,6 +56,9 @@ ALL_PRESETS = {
     "other": {"name": "Other Services", "ports": OTHER_PRESETS},
 }
 
+# All presets in category order; the preset tables never change at runtime
+ALL_PRESETS_FLAT = tuple(preset for category in ALL_PRESETS.values() for preset in category["ports"])
+
 
 def get_preset_display(preset, is_open=False):
     """Get display string for a preset."""
@@ -65,7 +68,4 @@ def get_preset_display(preset, is_open=False):
 
 def get_all_presets_flat():
     """Get all presets as a flat list."""
-    all_ports = []
-    for category in ALL_PRESETS.values():
-        all_ports.extend(category["ports"])
-    return all_ports
+    return list(ALL_PRESETS_FLAT)
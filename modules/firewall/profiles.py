@@ -16,7 +16,7 @@ from ui.components import (
 from ui.menu import run_menu_loop, text_input, select_from_list, confirm_action
 from utils.shell import run_command, require_root
 from utils.error_handler import handle_error
-from modules.firewall.common import is_ufw_installed, get_ufw_status_text
+from modules.firewall.common import is_ufw_installed, get_ufw_status_text, run_ufw_command
 
 
 # UFW application profiles directory
@@ -227,7 +227,8 @@ def apply_profile():
         press_enter_to_continue()
         return
     
-    result = run_command(f"ufw allow '{profile_name}'", check=False, silent=True)
+    # Output is kept: ufw's stderr explains a failure (e.g. unknown profile)
+    result = run_ufw_command(f"ufw allow '{profile_name}'")
     
     if result.returncode == 0:
         show_success(f"Profile '{profile_name}' applied!")
@@ -335,11 +336,11 @@ def create_profile():
     
     if success:
         # Update UFW app list
-        run_command("ufw app update vexo-custom", check=False, silent=True)
+        run_ufw_command("ufw app update vexo-custom", discard_output=True)
         show_success(f"Profile '{name}' created!")
         
         if confirm_action("Apply this profile now?"):
-            result = run_command(f"ufw allow '{name}'", check=False, silent=True)
+            result = run_ufw_command(f"ufw allow '{name}'", discard_output=True)
             if result.returncode == 0:
                 show_success(f"Profile applied!")
             else:
@@ -472,7 +473,7 @@ def edit_profile():
         return
     
     # Update UFW
-    run_command("ufw app update vexo-custom", check=False, silent=True)
+    run_ufw_command("ufw app update vexo-custom", discard_output=True)
     show_success("Profile updated!")
     
     press_enter_to_continue()
@@ -558,13 +559,13 @@ def delete_profile():
     
     # First remove any rules using this profile
     if confirm_action("Also remove firewall rules for this profile?"):
-        run_command(f"ufw delete allow '{profile_name}'", check=False, silent=True)
+        run_ufw_command(f"ufw delete allow '{profile_name}'", discard_output=True)
     
     # Remove from file
     success = _remove_profile_from_file(profile_name)
     
     if success:
-        run_command("ufw app update vexo-custom", check=False, silent=True)
+        run_ufw_command("ufw app update vexo-custom", discard_output=True)
         show_success(f"Profile '{profile_name}' deleted!")
     else:
         handle_error("E6001", "Failed to delete profile.")
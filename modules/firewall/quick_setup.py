@@ -12,13 +12,20 @@ from ui.components import (
 )
 from ui.menu import confirm_action
 from utils.shell import (
-    run_command,
     run_command_with_progress,
     is_installed,
     require_root,
 )
 from utils.error_handler import handle_error
-from modules.firewall.common import is_ufw_installed, is_ufw_active
+from modules.firewall.common import (
+    is_ufw_installed,
+    is_ufw_active,
+    get_ufw_state,
+    read_default_policies,
+    invalidate_ufw_cache,
+    run_ufw_batch,
+    run_ufw_command,
+)
 
 
 def install_ufw():
@@ -55,6 +62,7 @@ def install_ufw():
         press_enter_to_continue()
         return False
     
+    invalidate_ufw_cache()
     show_success("UFW installed successfully!")
     press_enter_to_continue()
     return True
@@ -66,20 +74,22 @@ def enable_firewall():
     show_header()
     show_panel("Enable Firewall", title="Firewall (UFW)", style="cyan")
     
-    console.print("[bold]This will configure UFW with:[/bold]")
-    console.print("  - Default: deny incoming, allow outgoing")
-    console.print("  - Allow SSH (port 22)")
-    console.print("  - Allow HTTP (port 80)")
-    console.print("  - Allow HTTPS (port 443)")
-    console.print()
+    console.print(
+        "[bold]This will configure UFW with:[/bold]\n"
+        "  - Default: deny incoming, allow outgoing\n"
+        "  - Allow SSH (port 22)\n"
+        "  - Allow HTTP (port 80)\n"
+        "  - Allow HTTPS (port 443)\n"
+    )
+    
+    state = get_ufw_state()
     
-    if is_ufw_active():
+    if state["active"]:
         show_info("UFW is already active.")
         if not confirm_action("Reconfigure with default rules?"):
             press_enter_to_continue()
             return
-    
-    if not confirm_action("Enable firewall with these rules?"):
+    elif not confirm_action("Enable firewall with these rules?"):
         show_warning("Cancelled.")
         press_enter_to_continue()
         return
@@ -90,35 +100,41 @@ def enable_firewall():
         press_enter_to_continue()
         return
     
-    if not is_ufw_installed():
+    if not state["installed"]:
         if not install_ufw():
             return
     
     show_info("Configuring firewall rules...")
     
-    run_command("ufw --force reset", check=False, silent=True)
-    run_command("ufw default deny incoming", check=False, silent=True)
-    run_command("ufw default allow outgoing", check=False, silent=True)
-    
     rules = [
         ("22/tcp", "SSH"),
         ("80/tcp", "HTTP"),
         ("443/tcp", "HTTPS"),
     ]
     
-    for port, name in rules:
-        result = run_command(f"ufw allow {port}", check=False, silent=True)
-        if result.returncode == 0:
+    # Policies already set survive the reset; re-setting them only triggers
+    # another reload
+    policies = read_default_policies() or {}
+    commands = ["ufw --force reset"]
+    for direction, policy in (("incoming", "deny"), ("outgoing", "allow")):
+        if policies.get(direction) != policy:
+            commands.append(f"ufw default {policy} {direction}")
+    
+    first_rule = len(commands)
+    commands.extend(f"ufw allow {port}" for port, _ in rules)
+    commands.append("ufw --force enable")
+    
+    results = run_ufw_batch(commands)
+    
+    for (port, name), ok in zip(rules, results[first_rule:-1]):
+        if ok:
             console.print(f"  [green]✓[/green] Allowed {name} ({port})")
         else:
             console.print(f"  [red]✗[/red] Failed to allow {name}")
     
     console.print()
-    show_info("Enabling UFW...")
     
-    result = run_command("ufw --force enable", check=False, silent=True)
-    
-    if result.returncode == 0:
+    if results[-1]:
         show_success("Firewall enabled successfully!")
     else:
         handle_error("E6001", "Failed to enable UFW.")
@@ -142,10 +158,10 @@ def disable_firewall():
         press_enter_to_continue()
         return
     
-    console.print("[red bold]WARNING: Disabling the firewall will expose all ports![/red bold]")
-    console.print()
-    console.print("[yellow]This is NOT recommended for production servers.[/yellow]")
-    console.print()
+    console.print(
+        "[red bold]WARNING: Disabling the firewall will expose all ports![/red bold]\n\n"
+        "[yellow]This is NOT recommended for production servers.[/yellow]\n"
+    )
     
     if not confirm_action("Are you sure you want to disable the firewall?"):
         show_warning("Cancelled.")
@@ -158,7 +174,7 @@ def disable_firewall():
         press_enter_to_continue()
         return
     
-    result = run_command("ufw --force disable", check=False, silent=True)
+    result = run_ufw_command("ufw --force disable", discard_output=True)
     
     if result.returncode == 0:
         show_warning("Firewall disabled!")
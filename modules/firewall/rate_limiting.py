@@ -18,6 +18,9 @@ from modules.firewall.common import (
     is_ufw_installed,
     get_ufw_status_text,
     get_ufw_rules,
+    invalidate_ufw_cache,
+    run_ufw_command,
+    ufw_lock,
     load_rate_limits,
     save_rate_limits,
     add_rate_limit_config,
@@ -212,16 +215,19 @@ def quick_ssh_protection():
     # First, delete existing SSH allow rules
     show_info("Updating SSH rules...")
     
-    # Get current rules and find SSH rules
-    rules = get_ufw_rules()
-    ssh_rules = [r for r in rules if "22" in r["rule"] and "ALLOW" in r["rule"]]
-    
-    # Delete existing SSH allow rules (in reverse order to maintain numbering)
-    for rule in reversed(ssh_rules):
-        run_command(f"ufw --force delete {rule['number']}", check=False, silent=True)
-    
-    # Add limit rule
-    result = run_command("ufw limit 22/tcp", check=False, silent=True)
+    # Read and change the rules under one lock so the numbers stay valid
+    with ufw_lock():
+        # Get current rules and find SSH rules
+        rules = get_ufw_rules()
+        ssh_rules = [r for r in rules if "22" in r["rule"] and "ALLOW" in r["rule"]]
+        
+        # Delete existing SSH allow rules (in reverse order to maintain numbering)
+        for rule in reversed(ssh_rules):
+            run_command(f"ufw --force delete {rule['number']}", check=False, silent=True, discard_output=True)
+        
+        # Add limit rule
+        result = run_command("ufw limit 22/tcp", check=False, silent=True, discard_output=True)
+    invalidate_ufw_cache()
     
     if result.returncode == 0:
         add_rate_limit_config("22", "tcp", "ssh_recommended", "6/30sec")
@@ -442,9 +448,18 @@ def remove_rate_limit():
         press_enter_to_continue()
         return
     
-    result = run_command(f"ufw --force delete {num}", check=False, silent=True)
-    
-    if result.returncode == 0:
+    with ufw_lock():
+        # Another session may have renumbered the rules since they were listed
+        current = {rule["number"]: rule["rule"] for rule in get_ufw_rules()}
+        if current.get(num) == selected["rule"]:
+            result = run_command(f"ufw --force delete {num}", check=False, silent=True, discard_output=True)
+        else:
+            result = None
+    invalidate_ufw_cache()
+    
+    if result is None:
+        handle_error("E6001", "Firewall rules changed since they were listed. Please try again.")
+    elif result.returncode == 0:
         # Extract port from rule and remove from config
         port_match = selected["rule"].split()[0]  # e.g., "22/tcp"
         if "/" in port_match:
@@ -455,7 +470,7 @@ def remove_rate_limit():
         
         # Offer to add back as allow rule
         if confirm_action("Add back as regular allow rule?"):
-            run_command(f"ufw allow {port_match}", check=False, silent=True)
+            run_ufw_command(f"ufw allow {port_match}", discard_output=True)
             show_success(f"Added allow rule for {port_match}.")
     else:
         handle_error("E6001", "Failed to remove rate limit.")
@@ -470,14 +485,16 @@ def _apply_rate_limit(port, protocol):
     except PermissionError:
         return False
     
-    # First remove any existing allow rule for this port
-    rules = get_ufw_rules()
-    for rule in reversed(rules):
-        if f"{port}/{protocol}" in rule["rule"] and "ALLOW" in rule["rule"]:
-            run_command(f"ufw --force delete {rule['number']}", check=False, silent=True)
-    
-    # Add limit rule
-    result = run_command(f"ufw limit {port}/{protocol}", check=False, silent=True)
+    with ufw_lock():
+        # First remove any existing allow rule for this port
+        rules = get_ufw_rules()
+        for rule in reversed(rules):
+            if f"{port}/{protocol}" in rule["rule"] and "ALLOW" in rule["rule"]:
+                run_command(f"ufw --force delete {rule['number']}", check=False, silent=True, discard_output=True)
+        
+        # Add limit rule
+        result = run_command(f"ufw limit {port}/{protocol}", check=False, silent=True, discard_output=True)
+    invalidate_ufw_cache()
     return result.returncode == 0
 
 
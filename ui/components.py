@@ -27,16 +27,19 @@ def show_header():
     c5 = "#009999"
     c6 = "#008080"  # Dark cyan
     
-    console.print()
-    console.print(f"[{c1}] ██╗   ██╗███████╗██╗  ██╗ ██████╗ [/{c1}]")
-    console.print(f"[{c2}] ██║   ██║██╔════╝╚██╗██╔╝██╔═══██╗[/{c2}]")
-    console.print(f"[{c3}] ██║   ██║█████╗   ╚███╔╝ ██║   ██║[/{c3}]")
-    console.print(f"[{c4}] ╚██╗ ██╔╝██╔══╝   ██╔██╗ ██║   ██║[/{c4}]")
-    console.print(f"[{c5}]  ╚████╔╝ ███████╗██╔╝ ██╗╚██████╔╝[/{c5}]")
-    console.print(f"[{c6}]   ╚═══╝  ╚══════╝╚═╝  ╚═╝ ╚═════╝ [/{c6}]")
-    console.print(f"  [bold cyan]{APP_TAGLINE}[/bold cyan]  [dim]v{APP_VERSION}[/dim]")
-    console.print(f"  [dim]{APP_DESCRIPTION}[/dim]")
-    console.print()
+    # Rendered as one print so each menu redraw is a single terminal write
+    console.print("\n".join([
+        "",
+        f"[{c1}] ██╗   ██╗███████╗██╗  ██╗ ██████╗ [/{c1}]",
+        f"[{c2}] ██║   ██║██╔════╝╚██╗██╔╝██╔═══██╗[/{c2}]",
+        f"[{c3}] ██║   ██║█████╗   ╚███╔╝ ██║   ██║[/{c3}]",
+        f"[{c4}] ╚██╗ ██╔╝██╔══╝   ██╔██╗ ██║   ██║[/{c4}]",
+        f"[{c5}]  ╚████╔╝ ███████╗██╔╝ ██╗╚██████╔╝[/{c5}]",
+        f"[{c6}]   ╚═══╝  ╚══════╝╚═╝  ╚═╝ ╚═════╝ [/{c6}]",
+        f"  [bold cyan]{APP_TAGLINE}[/bold cyan]  [dim]v{APP_VERSION}[/dim]",
+        f"  [dim]{APP_DESCRIPTION}[/dim]",
+        "",
+    ]))
 
 
 def show_system_bar():
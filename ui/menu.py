@@ -169,17 +169,21 @@ def select_from_list(title, message, options, allow_cancel=True):
     Args:
         title: Dialog title
         message: Prompt message
-        options: List of string options
+        options: List of string options, or (key, label) tuples to get
+                 the key of the selected option back
         allow_cancel: If True, add "← Cancel" option (default: True)
     
     Returns:
-        str: Selected option or None if cancelled
+        str: Selected option (or its key) or None if cancelled
     """
     if not options:
         return None
     
     # Build choices with optional cancel
-    choices = [Choice(value=opt, name=opt) for opt in options]
+    choices = [
+        Choice(value=opt[0], name=opt[1]) if isinstance(opt, tuple) else Choice(value=opt, name=opt)
+        for opt in options
+    ]
     if allow_cancel:
         choices.append(Choice(value=None, name="← Cancel"))
     
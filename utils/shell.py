@@ -7,7 +7,7 @@ from ui.components import console
 from utils.error_handler import handle_error
 
 
-def run_command(command, capture_output=True, check=True, silent=False):
+def run_command(command, capture_output=True, check=True, silent=False, discard_output=False):
     """
     Execute a shell command and return the result.
     
@@ -16,6 +16,8 @@ def run_command(command, capture_output=True, check=True, silent=False):
         capture_output: If True, capture stdout/stderr
         check: If True, raise exception on non-zero exit
         silent: If True, don't print errors
+        discard_output: If True, send stdout/stderr to /dev/null instead of
+                        capturing them (for commands whose output is unused)
     
     Returns:
         subprocess.CompletedProcess object with:
@@ -26,21 +28,26 @@ def run_command(command, capture_output=True, check=True, silent=False):
     Raises:
         subprocess.CalledProcessError: If check=True and command fails
     """
+    if discard_output:
+        output = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    else:
+        output = {"capture_output": capture_output}
+    
     try:
         if isinstance(command, str):
             result = subprocess.run(
                 command,
                 shell=True,
-                capture_output=capture_output,
                 text=True,
                 check=check,
+                **output,
             )
         else:
             result = subprocess.run(
                 command,
-                capture_output=capture_output,
                 text=True,
                 check=check,
+                **output,
             )
         return result
     
@@ -105,6 +112,35 @@ def run_command_realtime(command, description=""):
     return process.returncode
 
 
+def iter_command_lines(command):
+    """
+    Execute a shell command and yield its output line by line.
+    
+    Lines are handed over as the command writes them, so callers can parse
+    long output without holding all of it in memory. stderr is discarded.
+    
+    Args:
+        command: Command string or list of arguments
+    
+    Yields:
+        str: Each stdout line without the trailing newline
+    """
+    process = subprocess.Popen(
+        command,
+        shell=isinstance(command, str),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    
+    try:
+        for line in process.stdout:
+            yield line.rstrip('\n')
+    finally:
+        process.stdout.close()
+        process.wait()
+
+
 def is_installed(package):
     """
     Check if a package is installed via dpkg.